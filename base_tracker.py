@@ -6,13 +6,35 @@ management) that are shared across TWAPTracker, ScaledOrderTracker, and
 ConditionalOrderTracker.
 
 Subclasses supply their own serialization/deserialization and public API;
-this base handles only the repeated JSON-on-disk plumbing.
+this base handles only the repeated JSON-on-disk plumbing. Encoding and
+decoding use orjson when it is installed and fall back to the stdlib json
+module otherwise; both produce the same on-disk format. Whole-file saves
+are serialized up front and swapped into place with os.replace(), so a
+crash mid-save leaves the previous file intact. They are not fsync'd:
+everything stored here can be rebuilt from the exchange.
 """
 
 import json
 import os
 import logging
-from typing import Optional, List
+import threading
+from typing import Iterable, Iterator, Optional, List, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data):
+    """Parse JSON with orjson, falling back to the stdlib for what orjson rejects."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Files written by the stdlib may hold NaN/Infinity, which orjson rejects
+            pass
+    return json.loads(data)
 
 
 class BaseOrderTracker:
@@ -30,33 +52,133 @@ class BaseOrderTracker:
     def _get_subdir(self, name: str) -> str:
         return self._subdirs[name]
 
-    def _get_path(self, subdir_name: str, item_id: str) -> str:
-        return os.path.join(self._subdirs[subdir_name], f"{item_id}.json")
+    def _get_path(self, subdir_name: str, item_id: str, ext: str = ".json") -> str:
+        return os.path.join(self._subdirs[subdir_name], f"{item_id}{ext}")
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        """Write bytes to path via a temporary file and rename, so readers never see a partial file."""
+        # Unique per thread so concurrent saves of the same item don't share a temp file.
+        tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
     def _save_json(self, path: str, data: dict, label: str = "item") -> None:
         try:
-            with open(path, 'w') as f:
-                json.dump(data, f, indent=2)
+            if orjson is not None:
+                encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                encoded = json.dumps(data, indent=2).encode()
+            self._write_atomic(path, encoded)
         except Exception as e:
             logging.error(f"Error saving {label}: {e}")
             raise
 
+    def _read_json(self, path: str) -> Optional[dict]:
+        """
+        Read a JSON document, returning None if the file does not exist.
+
+        Unlike _load_json, a file that exists but cannot be read or parsed
+        raises, so callers can tell "missing" from "unreadable".
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        return _loads(data)
+
     def _load_json(self, path: str, label: str = "item") -> Optional[dict]:
         try:
-            if not os.path.exists(path):
-                return None
-            with open(path, 'r') as f:
-                return json.load(f)
+            return self._read_json(path)
         except Exception as e:
             logging.error(f"Error loading {label}: {e}")
             return None
 
+    def _encode_json_line(self, record: dict) -> bytes:
+        """Encode one record as a compact, newline-terminated JSON line."""
+        if orjson is not None:
+            return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        return (json.dumps(record, separators=(',', ':')) + '\n').encode()
+
+    def _decode_json_line(self, line: bytes) -> dict:
+        """Decode one line of a line-delimited JSON file."""
+        return _loads(line)
+
+    def _save_json_lines(self, path: str, records: Iterable[dict],
+                         label: str = "item") -> List[Tuple[int, int]]:
+        """Rewrite a line-delimited JSON file; return the (offset, length) of each record's line."""
+        try:
+            lines = [self._encode_json_line(record) for record in records]
+            spans = []
+            offset = 0
+            for line in lines:
+                spans.append((offset, len(line)))
+                offset += len(line)
+            self._write_atomic(path, b''.join(lines))
+            return spans
+        except Exception as e:
+            logging.error(f"Error saving {label}: {e}")
+            raise
+
+    def _append_json_line(self, path: str, record: dict, label: str = "item") -> Tuple[int, int]:
+        """Append a single record to a line-delimited JSON file; return its (offset, length)."""
+        try:
+            line = self._encode_json_line(record)
+            with open(path, 'a+b') as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                if offset:
+                    # Terminate a torn last line so it can't swallow this record.
+                    f.seek(offset - 1)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                        offset += 1
+                f.write(line)
+            return offset, len(line)
+        except Exception as e:
+            logging.error(f"Error appending {label}: {e}")
+            raise
+
+    def _iter_json_lines(self, path: str, label: str = "item") -> Iterator[dict]:
+        """Yield records from a line-delimited JSON file, skipping unreadable lines."""
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield _loads(line)
+                except ValueError as e:
+                    logging.warning(f"Skipping unreadable line {line_number} in {label}: {e}")
+
+    def _iter_json_line_spans(self, path: str) -> Iterator[Tuple[int, int, dict]]:
+        """Yield (offset, length, record) for each readable line of a line-delimited JSON file."""
+        if not os.path.exists(path):
+            return
+        offset = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield offset, len(line), self._decode_json_line(line)
+                    except ValueError:
+                        pass
+                offset += len(line)
+
     def _list_ids(self, subdir_name: str) -> List[str]:
         try:
             dir_path = self._subdirs[subdir_name]
             if not os.path.exists(dir_path):
                 return []
-            return [f[:-5] for f in os.listdir(dir_path) if f.endswith('.json')]
+            with os.scandir(dir_path) as entries:
+                return [entry.name[:-5] for entry in entries if entry.name.endswith('.json')]
         except Exception as e:
             logging.error(f"Error listing items in {subdir_name}: {e}")
             return []
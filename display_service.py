@@ -204,19 +204,17 @@ class DisplayService:
             list: List of TWAP order IDs that were displayed, or empty list if none found
         """
         try:
-            twap_ids = self.twap_tracker.list_twap_orders()
-            if not twap_ids:
+            twap_orders = list(self.twap_tracker.iter_twap_orders())
+            if not twap_orders:
                 print("No TWAP orders found")
                 return []
+            twap_ids = [twap_order.twap_id for twap_order in twap_orders]
 
             print("\nTWAP Orders:")
             print("=" * 100)
 
-            for i, twap_id in enumerate(twap_ids, 1):
-                twap_order = self.twap_tracker.get_twap_order(twap_id)
-                if not twap_order:
-                    continue
-
+            for i, twap_order in enumerate(twap_orders, 1):
+                twap_id = twap_order.twap_id
                 stats = self.twap_tracker.calculate_twap_statistics(twap_id)
 
                 print(f"\n{i}. TWAP ID: {twap_id}")
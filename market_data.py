@@ -367,6 +367,10 @@ class MarketDataService:
         """Round order size to appropriate precision for the product."""
         return self._precision.round_size(size, product_id)
 
+    def round_size_batch(self, sizes, product_id):
+        """Round an array of order sizes to the product's precision in one pass."""
+        return self._precision.round_size_batch(sizes, product_id)
+
     def round_price(self, price, product_id):
         """Round price to appropriate precision for the product."""
         return self._precision.round_price(price, product_id)
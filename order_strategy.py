@@ -13,6 +13,7 @@ Usage:
             ...
 """
 
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -30,7 +31,11 @@ class StrategyStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+# dataclass(slots=True) needs Python 3.10+; older interpreters get regular dataclasses.
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class SliceSpec:
     """
     Specification for a single order slice.
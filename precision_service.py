@@ -8,6 +8,8 @@ market data concerns.
 import math
 import logging
 
+import numpy as np
+
 
 class PrecisionService:
     """Rounds prices and sizes to product-specific increments."""
@@ -21,22 +23,34 @@ class PrecisionService:
         self.api_client = api_client
         self.precision_config = precision_config
 
-    def round_size(self, size, product_id):
-        """Round order size to appropriate precision for the product."""
+    def _size_precision(self, product_id):
+        """Return the number of size decimals for the product, or None if unknown."""
         try:
             product_info = self.api_client.get_product(product_id)
             base_increment = float(product_info['base_increment'])
             if base_increment >= 1:
-                precision = 0
-            else:
-                precision = abs(int(math.log10(base_increment)))
-            return round(float(size), precision)
+                return 0
+            return abs(int(math.log10(base_increment)))
         except Exception as e:
             logging.error(f"Error rounding size: {e}")
             if product_id in self.precision_config:
-                precision = self.precision_config[product_id]['size']
-                return round(float(size), precision)
+                return self.precision_config[product_id]['size']
+            return None
+
+    def round_size(self, size, product_id):
+        """Round order size to appropriate precision for the product."""
+        precision = self._size_precision(product_id)
+        if precision is None:
             return float(size)
+        return round(float(size), precision)
+
+    def round_size_batch(self, sizes, product_id) -> np.ndarray:
+        """Round an array of order sizes, looking up the product's precision once."""
+        sizes = np.asarray(sizes, dtype=np.float64)
+        precision = self._size_precision(product_id)
+        if precision is None:
+            return sizes
+        return np.round(sizes, precision)
 
     def round_price(self, price, product_id):
         """Round price to appropriate precision for the product."""
@@ -17,7 +17,7 @@ Usage:
 import json
 import logging
 from datetime import datetime
-from typing import Optional, List, Dict, Union
+from typing import Iterator, Optional, List, Dict, Union
 from dataclasses import asdict
 
 from database import Database
@@ -70,7 +70,7 @@ class SQLiteTWAPStorage(TWAPStorage):
             return None
         return self._row_to_twap_order(row)
 
-    def save_twap_fills(self, twap_id: str, fills: List[OrderFill]) -> None:
+    def save_twap_fills(self, twap_id: str, fills: List[OrderFill]) -> bool:
         with self._db.transaction() as conn:
             # Remove existing fills for this order
             conn.execute(
@@ -91,6 +91,7 @@ class SQLiteTWAPStorage(TWAPStorage):
                 ))
 
         logging.debug(f"Saved {len(fills)} fills for TWAP {twap_id}")
+        return True
 
     def get_twap_fills(self, twap_id: str) -> List[OrderFill]:
         rows = self._db.fetchall(
@@ -115,6 +116,13 @@ class SQLiteTWAPStorage(TWAPStorage):
         )
         return [row['order_id'] for row in rows]
 
+    def iter_twap_orders(self) -> Iterator[TWAPOrder]:
+        rows = self._db.fetchall(
+            "SELECT * FROM orders WHERE strategy_type = 'twap'"
+        )
+        for row in rows:
+            yield self._row_to_twap_order(row)
+
     def delete_twap_order(self, twap_id: str) -> bool:
         with self._db.transaction() as conn:
             conn.execute("DELETE FROM fills WHERE parent_order_id = ?", (twap_id,))
@@ -136,29 +144,48 @@ class SQLiteTWAPStorage(TWAPStorage):
 
         fills = self.get_twap_fills(twap_id)
 
+        # Single pass over the fills; accumulate every aggregate at once.
+        total_filled = total_value_filled = total_fees = 0.0
+        maker_fills = taker_fills = 0
+        first_fill_time = last_fill_time = None
+        for f in fills:
+            size = f.filled_size
+            total_filled += size
+            total_value_filled += size * f.price
+            total_fees += f.fee
+            if f.is_maker:
+                maker_fills += 1
+            else:
+                taker_fills += 1
+            trade_time = f.trade_time
+            if first_fill_time is None or trade_time < first_fill_time:
+                first_fill_time = trade_time
+            if last_fill_time is None or trade_time > last_fill_time:
+                last_fill_time = trade_time
+
         stats = {
             'twap_id': twap_id,
             'market': order.market,
             'side': order.side,
             'total_size': order.total_size,
-            'total_filled': sum(f.filled_size for f in fills),
-            'total_value_filled': sum(f.filled_size * f.price for f in fills),
-            'total_fees': sum(f.fee for f in fills),
-            'maker_fills': sum(1 for f in fills if f.is_maker),
-            'taker_fills': sum(1 for f in fills if not f.is_maker),
+            'total_filled': total_filled,
+            'total_value_filled': total_value_filled,
+            'total_fees': total_fees,
+            'maker_fills': maker_fills,
+            'taker_fills': taker_fills,
             'num_fills': len(fills),
             'completion_rate': 0.0,
             'average_price': 0.0,
             'vwap': 0.0,
         }
 
-        if stats['total_filled'] > 0:
-            stats['completion_rate'] = (stats['total_filled'] / order.total_size) * 100
-            stats['vwap'] = stats['total_value_filled'] / stats['total_filled']
+        if total_filled > 0:
+            stats['completion_rate'] = (total_filled / order.total_size) * 100
+            stats['vwap'] = total_value_filled / total_filled
 
         if fills:
-            stats['first_fill_time'] = min(f.trade_time for f in fills)
-            stats['last_fill_time'] = max(f.trade_time for f in fills)
+            stats['first_fill_time'] = first_fill_time
+            stats['last_fill_time'] = last_fill_time
 
         return stats
 
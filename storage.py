@@ -20,7 +20,7 @@ Usage:
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict
+from typing import Iterator, List, Optional, Dict
 import logging
 
 from twap_tracker import TWAPOrder, OrderFill, TWAPTracker
@@ -64,13 +64,16 @@ class TWAPStorage(ABC):
         pass
 
     @abstractmethod
-    def save_twap_fills(self, twap_id: str, fills: List[OrderFill]) -> None:
+    def save_twap_fills(self, twap_id: str, fills: List[OrderFill]) -> bool:
         """
         Save fills for a TWAP order.
 
         Args:
             twap_id: The TWAP order ID.
             fills: List of order fills to save.
+
+        Returns:
+            True if the fills were stored, False otherwise.
         """
         pass
 
@@ -97,6 +100,21 @@ class TWAPStorage(ABC):
         """
         pass
 
+    def iter_twap_orders(self) -> Iterator[TWAPOrder]:
+        """
+        Iterate over all stored TWAP orders.
+
+        Backends that can load orders in bulk should override this; the
+        default fetches each listed ID in turn.
+
+        Yields:
+            Each TWAP order that could be loaded.
+        """
+        for twap_id in self.list_twap_orders():
+            order = self.get_twap_order(twap_id)
+            if order is not None:
+                yield order
+
     @abstractmethod
     def delete_twap_order(self, twap_id: str) -> bool:
         """
@@ -133,7 +151,7 @@ class FileBasedTWAPStorage(TWAPStorage):
 
     Data is stored as JSON files in the configured base path:
     - {base_path}/orders/{twap_id}.json - TWAP order metadata
-    - {base_path}/fills/{twap_id}.json - Order fill information
+    - {base_path}/fills/{twap_id}.jsonl - Order fills, one JSON object per line
 
     Example:
         storage = FileBasedTWAPStorage(base_path="twap_data")
@@ -160,9 +178,9 @@ class FileBasedTWAPStorage(TWAPStorage):
         """Retrieve a TWAP order from JSON file."""
         return self._tracker.get_twap_order(twap_id)
 
-    def save_twap_fills(self, twap_id: str, fills: List[OrderFill]) -> None:
+    def save_twap_fills(self, twap_id: str, fills: List[OrderFill]) -> bool:
         """Save fills for a TWAP order to JSON file."""
-        self._tracker.save_twap_fills(twap_id, fills)
+        return self._tracker.save_twap_fills(twap_id, fills)
 
     def get_twap_fills(self, twap_id: str) -> List[OrderFill]:
         """Retrieve fills for a TWAP order from JSON file."""
@@ -172,6 +190,10 @@ class FileBasedTWAPStorage(TWAPStorage):
         """List all TWAP order IDs from file system."""
         return self._tracker.list_twap_orders()
 
+    def iter_twap_orders(self) -> Iterator[TWAPOrder]:
+        """Iterate over all TWAP orders, reading the files concurrently."""
+        return self._tracker.iter_twap_orders()
+
     def delete_twap_order(self, twap_id: str) -> bool:
         """
         Delete a TWAP order and its fills from file system.
@@ -185,7 +207,11 @@ class FileBasedTWAPStorage(TWAPStorage):
         import os
 
         order_path = self._tracker._get_order_path(twap_id)
-        fills_path = self._tracker._get_fills_path(twap_id)
+        fills_paths = (
+            self._tracker._get_fills_path(twap_id),
+            self._tracker._get_legacy_fills_path(twap_id),
+            self._tracker._get_fill_index_path(twap_id),
+        )
 
         deleted = False
 
@@ -194,9 +220,10 @@ class FileBasedTWAPStorage(TWAPStorage):
             deleted = True
             logging.info(f"Deleted TWAP order file: {order_path}")
 
-        if os.path.exists(fills_path):
-            os.remove(fills_path)
-            logging.info(f"Deleted TWAP fills file: {fills_path}")
+        for fills_path in fills_paths:
+            if os.path.exists(fills_path):
+                os.remove(fills_path)
+                logging.info(f"Deleted TWAP fills file: {fills_path}")
 
         return deleted
 
@@ -235,10 +262,11 @@ class InMemoryTWAPStorage(TWAPStorage):
         """Retrieve a TWAP order from memory."""
         return self._orders.get(twap_id)
 
-    def save_twap_fills(self, twap_id: str, fills: List[OrderFill]) -> None:
+    def save_twap_fills(self, twap_id: str, fills: List[OrderFill]) -> bool:
         """Save fills for a TWAP order in memory."""
         self._fills[twap_id] = fills
         logging.debug(f"Saved {len(fills)} fills for TWAP {twap_id}")
+        return True
 
     def get_twap_fills(self, twap_id: str) -> List[OrderFill]:
         """Retrieve fills for a TWAP order from memory."""
@@ -282,29 +310,48 @@ class InMemoryTWAPStorage(TWAPStorage):
 
         fills = self.get_twap_fills(twap_id)
 
+        # Single pass over the fills; accumulate every aggregate at once.
+        total_filled = total_value_filled = total_fees = 0.0
+        maker_fills = taker_fills = 0
+        first_fill_time = last_fill_time = None
+        for fill in fills:
+            size = fill.filled_size
+            total_filled += size
+            total_value_filled += size * fill.price
+            total_fees += fill.fee
+            if fill.is_maker:
+                maker_fills += 1
+            else:
+                taker_fills += 1
+            trade_time = fill.trade_time
+            if first_fill_time is None or trade_time < first_fill_time:
+                first_fill_time = trade_time
+            if last_fill_time is None or trade_time > last_fill_time:
+                last_fill_time = trade_time
+
         stats = {
             'twap_id': twap_id,
             'market': order.market,
             'side': order.side,
             'total_size': order.total_size,
-            'total_filled': sum(fill.filled_size for fill in fills),
-            'total_value_filled': sum(fill.filled_size * fill.price for fill in fills),
-            'total_fees': sum(fill.fee for fill in fills),
-            'maker_fills': sum(1 for fill in fills if fill.is_maker),
-            'taker_fills': sum(1 for fill in fills if not fill.is_maker),
+            'total_filled': total_filled,
+            'total_value_filled': total_value_filled,
+            'total_fees': total_fees,
+            'maker_fills': maker_fills,
+            'taker_fills': taker_fills,
             'num_fills': len(fills),
             'completion_rate': 0.0,
             'average_price': 0.0,
             'vwap': 0.0
         }
 
-        if stats['total_filled'] > 0:
-            stats['completion_rate'] = (stats['total_filled'] / order.total_size) * 100
-            stats['vwap'] = stats['total_value_filled'] / stats['total_filled']
+        if total_filled > 0:
+            stats['completion_rate'] = (total_filled / order.total_size) * 100
+            stats['vwap'] = total_value_filled / total_filled
 
         if fills:
-            stats['first_fill_time'] = min(fill.trade_time for fill in fills)
-            stats['last_fill_time'] = max(fill.trade_time for fill in fills)
+            stats['first_fill_time'] = first_fill_time
+            stats['last_fill_time'] = last_fill_time
 
         return stats
 
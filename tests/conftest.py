@@ -534,6 +534,20 @@ def reset_environment():
     os.environ.update(original_env)
 
 
+@pytest.fixture(autouse=True)
+def reset_vwap_caches():
+    """
+    Clear the shared VWAP volume and benchmark caches after every test.
+
+    Tests reuse product IDs with different mock candles, so cached profiles
+    must not leak from one test into the next.
+    """
+    yield
+
+    from vwap_strategy import clear_volume_cache
+    clear_volume_cache()
+
+
 @pytest.fixture
 def terminal_with_mocks(mock_api_client, mock_twap_storage, test_app_config, mock_rate_limiter, sqlite_db):
     """
@@ -239,6 +239,18 @@ class TestRounding:
         rounded = svc.round_size(1.123456789, 'BTC-USD')
         assert rounded == pytest.approx(1.12345679, rel=1e-8)
 
+    def test_round_size_batch_matches_round_size(self):
+        """Batch rounding should agree with per-size rounding and fetch the product once."""
+        api = MockCoinbaseAPI()
+        svc = _make_service(api_client=api)
+        sizes = [1.23456, 0.00004, 2.5]
+
+        with patch.object(api, 'get_product', wraps=api.get_product) as get_product:
+            rounded = svc.round_size_batch(sizes, 'SOL-USD')
+
+        assert get_product.call_count == 1
+        assert rounded.tolist() == [svc.round_size(size, 'SOL-USD') for size in sizes]
+
     def test_round_price_fallback_on_api_error(self):
         """If API call fails, precision_config overrides should be used."""
         api = Mock()
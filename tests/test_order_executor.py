@@ -497,6 +497,27 @@ class TestUpdateTWAPFills:
         result = twap_exec.update_twap_fills('twap-fill-5', storage)
         assert result is True
 
+    def test_failed_fill_save_leaves_order_totals(self):
+        """Order totals should not be updated when the fills could not be saved."""
+        twap_exec, api, md, storage = _make_twap_executor()
+        twap_order = TWAPOrder(
+            twap_id='twap-fill-6', market='BTC-USDC', side='BUY',
+            total_size=0.1, limit_price=50000.0, num_slices=1,
+            start_time='2026-01-01T00:00:00Z', status='active',
+            orders=['order-1'], failed_slices=[], slice_statuses=[]
+        )
+        storage.save_twap_order(twap_order)
+        api.simulate_fill('order-1', 0.1, 50000.0, is_maker=True)
+
+        with patch.object(storage, 'save_twap_fills', return_value=False):
+            result = twap_exec.update_twap_fills('twap-fill-6', storage)
+
+        assert result is False
+        updated = storage.get_twap_order('twap-fill-6')
+        assert updated.status == 'active'
+        assert updated.total_filled == 0.0
+        assert updated.last_fill_time is None
+
 
 # =============================================================================
 # place_twap_slice Edge Cases
@@ -73,6 +73,12 @@ class TestSQLiteTWAPStorage:
         ids = sqlite_twap_storage.list_twap_orders()
         assert sample_twap_order.twap_id in ids
 
+    def test_iter_twap_orders(self, sqlite_twap_storage, sample_twap_order):
+        sqlite_twap_storage.save_twap_order(sample_twap_order)
+        orders = list(sqlite_twap_storage.iter_twap_orders())
+        assert [o.twap_id for o in orders] == [sample_twap_order.twap_id]
+        assert orders[0].total_size == sample_twap_order.total_size
+
     def test_delete_twap_order(self, sqlite_twap_storage, sample_twap_order, sample_order_fills):
         sqlite_twap_storage.save_twap_order(sample_twap_order)
         sqlite_twap_storage.save_twap_fills(sample_twap_order.twap_id, sample_order_fills)
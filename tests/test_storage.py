@@ -75,6 +75,15 @@ class TestFileBasedTWAPStorage:
     def test_list_orders_empty(self, storage):
         assert storage.list_twap_orders() == []
 
+    def test_iter_orders(self, storage):
+        for i in range(3):
+            storage.save_twap_order(_make_order(f'twap-{i}'))
+        orders = list(storage.iter_twap_orders())
+        assert {o.twap_id for o in orders} == {'twap-0', 'twap-1', 'twap-2'}
+
+    def test_iter_orders_empty(self, storage):
+        assert list(storage.iter_twap_orders()) == []
+
     def test_delete_order(self, storage):
         order = _make_order()
         fills = _make_fills()
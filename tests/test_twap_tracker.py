@@ -10,8 +10,13 @@ To run these tests:
 """
 
 import pytest
+import json
 import os
-from twap_tracker import TWAPTracker, TWAPOrder, OrderFill
+import sys
+from dataclasses import asdict
+from unittest.mock import patch
+import base_tracker
+from twap_tracker import TWAPTracker, TWAPOrder, OrderFill, make_fee_fn
 
 
 # =============================================================================
@@ -192,6 +197,219 @@ class TestFillPersistence:
         assert len(loaded_fills) == 1
         assert loaded_fills[0].order_id == 'order-3'
 
+    def test_fills_stored_one_per_line(self, temp_storage_dir, sample_order_fills):
+        """Test that fills are written as line-delimited JSON, one fill per line."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = 'test-twap-123'
+
+        tracker.save_twap_fills(twap_id, sample_order_fills)
+
+        assert tracker._get_fills_path(twap_id).endswith('.jsonl')
+        with open(tracker._get_fills_path(twap_id)) as f:
+            records = [json.loads(line) for line in f]
+
+        assert [r['order_id'] for r in records] == ['order-1', 'order-2']
+        assert records[0]['filled_size'] == 0.1
+        assert records[1]['is_maker'] is False
+
+    def test_append_twap_fill(self, temp_storage_dir, sample_order_fills):
+        """Test that appending adds a line without rewriting earlier fills."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = 'test-twap-123'
+
+        tracker.save_twap_fills(twap_id, sample_order_fills[:1])
+        with open(tracker._get_fills_path(twap_id), 'rb') as f:
+            first_line = f.read()
+
+        tracker._append_twap_fill(twap_id, sample_order_fills[1])
+
+        with open(tracker._get_fills_path(twap_id), 'rb') as f:
+            assert f.read().startswith(first_line)
+        assert tracker.get_twap_fills(twap_id) == sample_order_fills
+
+    def test_iter_twap_fills_streams(self, temp_storage_dir, sample_order_fills):
+        """Test that iter_twap_fills yields fills lazily in stored order."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = 'test-twap-123'
+        tracker.save_twap_fills(twap_id, sample_order_fills)
+
+        fills = tracker.iter_twap_fills(twap_id)
+
+        assert next(fills) == sample_order_fills[0]
+        assert list(fills) == sample_order_fills[1:]
+        assert list(tracker.iter_twap_fills('nonexistent-id')) == []
+
+    def test_torn_trailing_line_is_skipped(self, temp_storage_dir, sample_order_fills):
+        """Test that a partially written last line does not hide earlier fills."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = 'test-twap-123'
+
+        tracker.save_twap_fills(twap_id, sample_order_fills)
+        with open(tracker._get_fills_path(twap_id), 'a') as f:
+            f.write('{"order_id": "order-3", "trade')
+
+        assert tracker.get_twap_fills(twap_id) == sample_order_fills
+
+    @pytest.mark.parametrize("legacy_layout", ["records", "columns"])
+    def test_load_legacy_json_fills(self, temp_storage_dir, sample_twap_order, sample_order_fills,
+                                    legacy_layout):
+        """Test that fills saved as a single JSON document are still readable."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = sample_twap_order.twap_id
+        tracker.save_twap_order(sample_twap_order)
+
+        records = [asdict(fill) for fill in sample_order_fills]
+        if legacy_layout == "columns":
+            data = {name: [r[name] for r in records] for name in records[0]}
+        else:
+            data = records
+        with open(tracker._get_legacy_fills_path(twap_id), 'w') as f:
+            json.dump(data, f)
+
+        loaded_fills = tracker.get_twap_fills(twap_id)
+        assert loaded_fills == sample_order_fills
+
+        stats = tracker.calculate_twap_statistics(twap_id)
+        assert stats['total_filled'] == 0.2
+        assert stats['maker_fills'] == 1
+
+    def test_append_converts_legacy_fills(self, temp_storage_dir, sample_order_fills):
+        """Test that the first append moves legacy fills into the line-delimited log."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = 'test-twap-123'
+
+        with open(tracker._get_legacy_fills_path(twap_id), 'w') as f:
+            json.dump([asdict(sample_order_fills[0])], f)
+
+        tracker._append_twap_fill(twap_id, sample_order_fills[1])
+
+        assert not os.path.exists(tracker._get_legacy_fills_path(twap_id))
+        assert tracker.get_twap_fills(twap_id) == sample_order_fills
+
+    def test_append_keeps_unreadable_legacy_fills(self, temp_storage_dir, sample_order_fills):
+        """Test that a corrupt legacy fills file is neither converted nor deleted."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = 'test-twap-123'
+        legacy_path = tracker._get_legacy_fills_path(twap_id)
+
+        truncated = json.dumps([asdict(sample_order_fills[0])])[:-10]
+        with open(legacy_path, 'w') as f:
+            f.write(truncated)
+
+        with pytest.raises(ValueError):
+            tracker._append_twap_fill(twap_id, sample_order_fills[1])
+
+        assert not os.path.exists(tracker._get_fills_path(twap_id))
+        with open(legacy_path) as f:
+            assert f.read() == truncated
+
+    def test_append_converts_legacy_fills_with_nan(self, temp_storage_dir, sample_order_fills):
+        """Test that legacy files holding stdlib-only NaN values are converted, not dropped."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = 'test-twap-123'
+
+        legacy = asdict(sample_order_fills[0])
+        legacy['fee'] = float('nan')
+        with open(tracker._get_legacy_fills_path(twap_id), 'w') as f:
+            json.dump([legacy], f)
+
+        tracker._append_twap_fill(twap_id, sample_order_fills[1])
+
+        fills = tracker.get_twap_fills(twap_id)
+        assert [fill.order_id for fill in fills] == [sample_order_fills[0].order_id, sample_order_fills[1].order_id]
+        assert not os.path.exists(tracker._get_legacy_fills_path(twap_id))
+
+    def test_stdlib_nan_fill_lines_are_read(self, temp_storage_dir, sample_order_fills):
+        """Test that fill lines holding stdlib-only NaN are read rather than skipped."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = 'test-twap-123'
+
+        tracker.save_twap_fills(twap_id, sample_order_fills[:1])
+        nan_fill = asdict(sample_order_fills[1])
+        nan_fill['fee'] = float('nan')
+        with open(tracker._get_fills_path(twap_id), 'a') as f:
+            f.write(json.dumps(nan_fill) + '\n')
+
+        fills = tracker.get_twap_fills(twap_id)
+        assert [fill.order_id for fill in fills] == [f.order_id for f in sample_order_fills]
+        assert len(tracker.get_fills_for_order(twap_id, sample_order_fills[1].order_id)) == 1
+
+    def test_round_trip_without_orjson(self, temp_storage_dir, monkeypatch,
+                                       sample_twap_order, sample_order_fills):
+        """Test that persistence falls back to stdlib json when orjson is unavailable."""
+        monkeypatch.setattr(base_tracker, 'orjson', None)
+        tracker = TWAPTracker(temp_storage_dir)
+
+        tracker.save_twap_order(sample_twap_order)
+        tracker.save_twap_fills(sample_twap_order.twap_id, sample_order_fills)
+
+        assert tracker.get_twap_order(sample_twap_order.twap_id) == sample_twap_order
+        assert tracker.get_twap_fills(sample_twap_order.twap_id) == sample_order_fills
+
+    def test_failed_save_keeps_previous_file(self, temp_storage_dir, sample_twap_order):
+        """Test that a save that fails mid-write leaves the previous order file intact."""
+        tracker = TWAPTracker(temp_storage_dir)
+        tracker.save_twap_order(sample_twap_order)
+
+        sample_twap_order.status = 'completed'
+        with patch('base_tracker.os.replace', side_effect=OSError("disk full")):
+            tracker.save_twap_order(sample_twap_order)
+
+        assert tracker.get_twap_order(sample_twap_order.twap_id).status == 'active'
+        assert [f for f in os.listdir(tracker.orders_dir) if f.endswith('.tmp')] == []
+
+    def test_serialized_dicts_match_asdict(self, sample_twap_order, sample_order_fills):
+        """Test that the direct serializers produce the same dicts as dataclasses.asdict."""
+        from twap_tracker import _order_to_dict, _fill_to_dict
+
+        assert _order_to_dict(sample_twap_order) == asdict(sample_twap_order)
+        assert _fill_to_dict(sample_order_fills[0]) == asdict(sample_order_fills[0])
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    def test_dataclasses_have_no_instance_dict(self, sample_twap_order, sample_order_fills):
+        """Test that TWAPOrder and OrderFill instances are slotted."""
+        assert not hasattr(sample_twap_order, '__dict__')
+        assert not hasattr(sample_order_fills[0], '__dict__')
+
+    def test_get_fills_for_order_uses_index(self, temp_storage_dir, sample_order_fills):
+        """Test that fills of one child order are found across saves and appends."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = 'test-twap-123'
+        extra_fill = OrderFill(order_id='order-1', trade_id='trade-3', filled_size=0.05,
+                               price=50200.0, fee=1.0, is_maker=False,
+                               trade_time='2025-01-01T00:02:00Z')
+
+        tracker.save_twap_fills(twap_id, sample_order_fills)
+        tracker._append_twap_fill(twap_id, extra_fill)
+
+        assert tracker.get_fills_for_order(twap_id, 'order-1') == [sample_order_fills[0], extra_fill]
+        assert tracker.get_fills_for_order(twap_id, 'order-2') == [sample_order_fills[1]]
+        assert tracker.get_fills_for_order(twap_id, 'order-9') == []
+
+    def test_stale_fill_index_is_rebuilt(self, temp_storage_dir, sample_order_fills):
+        """Test that a missing or out-of-date index is rebuilt from the fills log."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = 'test-twap-123'
+        tracker.save_twap_fills(twap_id, sample_order_fills[:1])
+
+        # A fill written without its index record, as after a crash mid-append.
+        with open(tracker._get_fills_path(twap_id), 'a') as f:
+            f.write(json.dumps(asdict(sample_order_fills[1])) + '\n')
+        assert tracker.get_fills_for_order(twap_id, 'order-2') == [sample_order_fills[1]]
+
+        os.remove(tracker._get_fill_index_path(twap_id))
+        assert tracker.get_fills_for_order(twap_id, 'order-1') == [sample_order_fills[0]]
+        assert os.path.exists(tracker._get_fill_index_path(twap_id))
+
+    def test_get_fills_for_order_legacy(self, temp_storage_dir, sample_order_fills):
+        """Test that per-order lookup falls back to scanning legacy fills files."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = 'test-twap-123'
+        with open(tracker._get_legacy_fills_path(twap_id), 'w') as f:
+            json.dump([asdict(fill) for fill in sample_order_fills], f)
+
+        assert tracker.get_fills_for_order(twap_id, 'order-2') == [sample_order_fills[1]]
+
 
 # =============================================================================
 # Statistics Calculation Tests
@@ -294,6 +512,120 @@ class TestTWAPStatistics:
         assert stats['first_fill_time'] == '2025-01-01T00:00:00Z'
         assert stats['last_fill_time'] == '2025-01-01T00:01:00Z'
 
+    def test_append_fill_maintains_running_totals(self, temp_storage_dir, sample_twap_order,
+                                                  sample_order_fills):
+        """Test that append_fill keeps the order totals in step with the fills file."""
+        tracker = TWAPTracker(temp_storage_dir)
+        tracker.save_twap_order(sample_twap_order)
+
+        for fill in sample_order_fills:
+            tracker.append_fill(sample_twap_order.twap_id, fill)
+
+        order = tracker.get_twap_order(sample_twap_order.twap_id)
+        assert order.total_filled == pytest.approx(0.2)
+        assert order.maker_orders == 1
+        assert order.taker_orders == 1
+        assert order.first_fill_time == '2025-01-01T00:00:00Z'
+        assert order.last_fill_time == '2025-01-01T00:01:00Z'
+        assert tracker.get_twap_fills(sample_twap_order.twap_id) == sample_order_fills
+
+        fast = tracker.calculate_twap_statistics(sample_twap_order.twap_id)
+        verified = tracker.calculate_twap_statistics(sample_twap_order.twap_id, verify=True)
+        assert fast == pytest.approx(verified)
+
+    def test_statistics_from_running_totals_skip_fills_file(self, temp_storage_dir, sample_twap_order,
+                                                            sample_order_fills):
+        """Test that tracked orders answer statistics without reading the fills file."""
+        tracker = TWAPTracker(temp_storage_dir)
+        tracker.save_twap_order(sample_twap_order)
+        for fill in sample_order_fills:
+            tracker.append_fill(sample_twap_order.twap_id, fill)
+
+        os.remove(tracker._get_fills_path(sample_twap_order.twap_id))
+
+        stats = tracker.calculate_twap_statistics(sample_twap_order.twap_id)
+        assert stats['num_fills'] == 2
+        assert stats['vwap'] == pytest.approx(50050.0)
+        assert tracker.calculate_twap_statistics(sample_twap_order.twap_id, verify=True)['num_fills'] == 0
+
+    def test_append_fill_seeds_totals_from_saved_fills(self, temp_storage_dir, sample_twap_order,
+                                                       sample_order_fills):
+        """Test that appending to bulk-saved fills counts the earlier fills too."""
+        tracker = TWAPTracker(temp_storage_dir)
+        tracker.save_twap_order(sample_twap_order)
+        tracker.save_twap_fills(sample_twap_order.twap_id, sample_order_fills[:1])
+
+        tracker.append_fill(sample_twap_order.twap_id, sample_order_fills[1])
+
+        stats = tracker.calculate_twap_statistics(sample_twap_order.twap_id)
+        assert stats['num_fills'] == 2
+        assert stats['total_value_filled'] == pytest.approx(10010.0)
+
+    def test_save_fills_rebuilds_running_totals(self, temp_storage_dir, sample_twap_order,
+                                                sample_order_fills):
+        """Test that replacing the fills keeps the statistics fast path in step with them."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = sample_twap_order.twap_id
+        tracker.save_twap_order(sample_twap_order)
+        tracker.append_fill(twap_id, sample_order_fills[0])
+
+        tracker.save_twap_fills(twap_id, [])
+        stats = tracker.calculate_twap_statistics(twap_id)
+        assert stats['num_fills'] == 0
+        assert stats == tracker.calculate_twap_statistics(twap_id, verify=True)
+
+        tracker.append_fill(twap_id, sample_order_fills[0])
+        tracker.save_twap_fills(twap_id, sample_order_fills)
+        stats = tracker.calculate_twap_statistics(twap_id)
+        assert stats['num_fills'] == 2
+        assert stats == pytest.approx(tracker.calculate_twap_statistics(twap_id, verify=True))
+
+    def test_failed_fill_save_returns_false(self, temp_storage_dir, sample_twap_order,
+                                            sample_order_fills):
+        """Test that save_twap_fills reports a failed write and keeps the running totals."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = sample_twap_order.twap_id
+        tracker.save_twap_order(sample_twap_order)
+        tracker.append_fill(twap_id, sample_order_fills[0])
+
+        with patch.object(tracker, '_write_twap_fills', side_effect=OSError("disk full")):
+            assert tracker.save_twap_fills(twap_id, sample_order_fills) is False
+
+        assert tracker.calculate_twap_statistics(twap_id)['num_fills'] == 1
+        assert tracker.save_twap_fills(twap_id, sample_order_fills) is True
+
+    def test_statistics_cached_until_files_change(self, temp_storage_dir, sample_twap_order,
+                                                  sample_order_fills):
+        """Test that repeated statistics calls reuse the cached result until a file changes."""
+        tracker = TWAPTracker(temp_storage_dir)
+        twap_id = sample_twap_order.twap_id
+        tracker.save_twap_order(sample_twap_order)
+        tracker.save_twap_fills(twap_id, sample_order_fills[:1])
+
+        with patch.object(tracker, '_compute_twap_statistics',
+                          wraps=tracker._compute_twap_statistics) as compute:
+            first = tracker.calculate_twap_statistics(twap_id)
+            second = tracker.calculate_twap_statistics(twap_id)
+            assert compute.call_count == 1
+            assert first == second
+
+            tracker._append_twap_fill(twap_id, sample_order_fills[1])
+            stats = tracker.calculate_twap_statistics(twap_id)
+            assert compute.call_count == 2
+            assert stats['num_fills'] == 2
+
+    def test_statistics_cache_is_bounded(self, temp_storage_dir, sample_twap_order, monkeypatch):
+        """Test that the statistics cache evicts the least recently used TWAP."""
+        monkeypatch.setattr('twap_tracker.STATS_CACHE_SIZE', 2)
+        tracker = TWAPTracker(temp_storage_dir)
+
+        for twap_id in ('twap-a', 'twap-b', 'twap-c'):
+            sample_twap_order.twap_id = twap_id
+            tracker.save_twap_order(sample_twap_order)
+            tracker.calculate_twap_statistics(twap_id)
+
+        assert list(tracker._stats_cache) == ['twap-b', 'twap-c']
+
 
 # =============================================================================
 # Fee Calculation Tests
@@ -381,6 +713,25 @@ class TestFeeCalculation:
         # Expected: 0.01 * 50000.0 * 0.004 = 2.0
         assert fee == pytest.approx(2.0)
 
+    def test_make_fee_fn_matches_calculate_fee(self, temp_storage_dir):
+        """Test that the batch fee function agrees with calculate_fee."""
+        tracker = TWAPTracker(temp_storage_dir)
+        fee_tier = {
+            'maker_fee_rate': '0.002',
+            'taker_fee_rate': '0.005'
+        }
+
+        fee = make_fee_fn(fee_tier)
+
+        for size, price, is_maker in [(1.0, 50000.0, True), (2.0, 50000.0, False), (0.01, 123.45, True)]:
+            assert fee(size, price, is_maker) == pytest.approx(
+                tracker.calculate_fee(size, price, fee_tier, is_maker))
+
+    def test_make_fee_fn_requires_both_rates(self):
+        """Test that an incomplete fee tier is rejected up front."""
+        with pytest.raises(KeyError):
+            make_fee_fn({'maker_fee_rate': '0.002'})
+
 
 # =============================================================================
 # Integration Tests (Multiple Components)
@@ -0,0 +1,123 @@
+"""
+Unit tests for ui_helpers color and formatting utilities.
+
+To run these tests:
+    pytest tests/test_ui_helpers.py -v
+"""
+
+import pytest
+from colorama import Fore, Style
+
+import ui_helpers
+from ui_helpers import (
+    color_text, success, error, warning, info, highlight, bright,
+    format_currency, format_percentage, format_side, format_status,
+    set_color_enabled,
+)
+
+
+@pytest.fixture(autouse=True)
+def color_enabled():
+    """Force colored output; pytest captures stdout, which is not a terminal."""
+    previous = ui_helpers._COLOR_ENABLED
+    set_color_enabled(True)
+    yield
+    set_color_enabled(previous)
+
+
+@pytest.mark.unit
+class TestColorWrappers:
+    """Tests for the basic color wrapper functions."""
+
+    @pytest.mark.parametrize("func, color", [
+        (success, Fore.GREEN),
+        (error, Fore.RED),
+        (warning, Fore.YELLOW),
+        (info, Fore.CYAN),
+        (highlight, Fore.MAGENTA),
+        (bright, Style.BRIGHT),
+    ])
+    def test_wraps_text_with_color_and_reset(self, func, color):
+        assert func("hello") == f"{color}hello{Style.RESET_ALL}"
+
+    def test_color_text(self):
+        assert color_text("BUY", Fore.GREEN) == f"{Fore.GREEN}BUY{Style.RESET_ALL}"
+
+    def test_color_text_is_cached(self):
+        color_text.cache_clear()
+        color_text("SELL", Fore.RED)
+        color_text("SELL", Fore.RED)
+        assert color_text.cache_info().hits == 1
+
+
+@pytest.mark.unit
+class TestFormatNumbers:
+    """Tests for currency and percentage formatting."""
+
+    def test_format_currency_colors_by_sign(self):
+        assert format_currency(1234.5) == success("$1,234.50")
+        assert format_currency(-2.0) == error("$-2.00")
+        assert format_currency(0.0) == "$0.00"
+
+    def test_format_currency_uncolored(self):
+        assert format_currency(1234.5, colored=False) == "$1,234.50"
+
+    def test_format_percentage_colors_by_sign(self):
+        assert format_percentage(1.5) == success("+1.50%")
+        assert format_percentage(-0.25) == error("-0.25%")
+        assert format_percentage(0) == "+0.00%"
+        assert format_percentage(float('nan')) == "+nan%"
+
+    def test_format_percentage_uncolored(self):
+        assert format_percentage(-3.0, colored=False) == "-3.00%"
+
+
+@pytest.mark.unit
+class TestFormatSideAndStatus:
+    """Tests for side and status formatting."""
+
+    def test_format_side(self):
+        assert format_side("BUY") == success("BUY")
+        assert format_side("sell") == error("sell")
+        assert format_side("OTHER") == "OTHER"
+
+    @pytest.mark.parametrize("status, wrapper", [
+        ("FILLED", success),
+        ("completed", success),
+        ("SUCCESS", success),
+        ("CANCELLED", error),
+        ("REJECTED", error),
+        ("FAILED", error),
+        ("expired", error),
+        ("PENDING", warning),
+        ("OPEN", warning),
+        ("active", warning),
+    ])
+    def test_format_status(self, status, wrapper):
+        assert format_status(status) == wrapper(status)
+
+    def test_format_status_unknown(self):
+        assert format_status("UNKNOWN") == "UNKNOWN"
+
+
+@pytest.mark.unit
+class TestColorDisabled:
+    """Tests for plain-text output when color is turned off."""
+
+    def test_wrappers_return_plain_text(self):
+        set_color_enabled(False)
+        assert success("ok") == "ok"
+        assert color_text("BUY", Fore.GREEN) == "BUY"
+        assert format_status("FILLED") == "FILLED"
+        assert format_side("SELL") == "SELL"
+        assert format_currency(-5.0) == "$-5.00"
+        assert format_percentage(2.0) == "+2.00%"
+
+    def test_no_color_env_disables_color(self, monkeypatch):
+        monkeypatch.setenv("NO_COLOR", "1")
+        assert ui_helpers._stdout_supports_color() is False
+
+    def test_non_tty_disables_color(self, monkeypatch):
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        monkeypatch.setattr(ui_helpers.sys.stdout, "isatty", lambda: False, raising=False)
+        assert ui_helpers._stdout_supports_color() is False
@@ -48,6 +48,13 @@ class TestPriceValidation:
         with pytest.raises(ValidationError, match="must be a valid number"):
             InputValidator.validate_price("not a number")
 
+    def test_validate_price_converts_to_float(self):
+        """Test that ints and numeric strings come back as floats."""
+        for raw in (100, "100", 100.0):
+            price = InputValidator.validate_price(raw)
+            assert price == 100.0
+            assert type(price) is float
+
 
 # =============================================================================
 # Size Validation Tests
@@ -112,6 +119,28 @@ class TestSizeValidation:
             )
 
 
+@pytest.mark.unit
+class TestSizesValidation:
+    """Tests for batch order size validation."""
+
+    def test_validate_sizes_valid(self):
+        """Test that sizes inside the range are returned as an array."""
+        sizes = InputValidator.validate_sizes([0.5, 0.25, 1], min_size=0.001, max_size=100)
+        assert sizes.tolist() == [0.5, 0.25, 1.0]
+
+    @pytest.mark.parametrize("sizes, bad_index", [
+        ([0.5, 0.0005, 0.5], 1),
+        ([0.5, 0.5, 150.0], 2),
+        ([0.0, 0.5], 0),
+        ([0.5, float('nan')], 1),
+    ])
+    def test_validate_sizes_reports_first_bad_size(self, sizes, bad_index):
+        """Test that the first out-of-range size is named in the error."""
+        with pytest.raises(ValidationError, match=f"index {bad_index}") as exc_info:
+            InputValidator.validate_sizes(sizes, min_size=0.001, max_size=100)
+        assert exc_info.value.field == "size"
+
+
 # =============================================================================
 # TWAP Duration Validation Tests
 # =============================================================================
@@ -223,6 +252,16 @@ class TestNumSlicesValidation:
             # Error message should suggest max valid slices (100)
             assert "100" in str(e)
 
+    def test_validate_num_slices_exact_split(self):
+        """Test that a total splitting exactly into min-size slices is accepted."""
+        assert InputValidator.validate_num_slices(35, total_size=0.35, min_size=0.01) == 35
+        assert InputValidator.validate_num_slices(3, total_size=0.3, min_size=0.1) == 3
+
+    def test_validate_num_slices_one_past_exact_split(self):
+        """Test that one slice past an exact split is rejected with the right maximum."""
+        with pytest.raises(ValidationError, match="at most 35"):
+            InputValidator.validate_num_slices(36, total_size=0.35, min_size=0.01)
+
 
 # =============================================================================
 # Side Validation Tests
@@ -286,6 +325,21 @@ class TestProductIDValidation:
         with pytest.raises(ValidationError, match="both base and quote"):
             InputValidator.validate_product_id('BTC-')
 
+    def test_validate_product_id_caches_valid_ids(self):
+        """Test that repeated valid IDs are served from the success cache."""
+        import validators
+        assert InputValidator.validate_product_id(' sol-usd ') == 'SOL-USD'
+        assert validators._valid_product_ids[' sol-usd '] == 'SOL-USD'
+        assert InputValidator.validate_product_id(' sol-usd ') == 'SOL-USD'
+
+    def test_validate_product_id_does_not_cache_failures(self):
+        """Test that rejected IDs are rejected again on every call."""
+        import validators
+        for _ in range(2):
+            with pytest.raises(ValidationError):
+                InputValidator.validate_product_id('SOLUSD')
+        assert 'SOLUSD' not in validators._valid_product_ids
+
 
 # =============================================================================
 # Price Type Validation Tests
@@ -341,6 +395,29 @@ class TestValidationError:
         assert error.value == 0.001
         assert error.message == "Test"
 
+    def test_validation_error_lazy_message(self):
+        """Test that a (template, args) message is formatted when read."""
+        error = ValidationError(("Size must be at least {}", (0.01,)), field="size", value=0.001)
+        assert error.message == "Size must be at least 0.01"
+        assert str(error) == "size: Size must be at least 0.01"
+
+    def test_validation_error_args_and_repr_are_formatted(self):
+        """Test that args and repr carry the formatted message, not the template."""
+        error = ValidationError(("Size must be at least {}", (0.01,)), field="size", value=0.001)
+        assert error.args == ("Size must be at least 0.01",)
+        assert repr(error) == "ValidationError('Size must be at least 0.01')"
+
+    def test_validation_error_is_slotted(self):
+        """Test that ValidationError declares slots for its attributes."""
+        assert set(ValidationError.__slots__) >= {"field", "value"}
+
+    def test_validation_error_pickles(self):
+        """Test that ValidationError survives a pickle round trip."""
+        import pickle
+        error = pickle.loads(pickle.dumps(ValidationError(("Bad {}", (1,)), field="size", value=1)))
+        assert str(error) == "size: Bad 1"
+        assert error.value == 1
+
 
 # =============================================================================
 # Price Range Validation Tests
@@ -414,6 +491,17 @@ class TestNumOrdersValidation:
                 num_orders=200, total_size=1.0, min_size=0.01
             )
 
+    def test_exact_split_accepted(self):
+        assert InputValidator.validate_num_orders(
+            num_orders=35, total_size=0.35, min_size=0.01
+        ) == 35
+
+    def test_one_past_exact_split_rejected(self):
+        with pytest.raises(ValidationError, match="at most 35"):
+            InputValidator.validate_num_orders(
+                num_orders=36, total_size=0.35, min_size=0.01
+            )
+
     def test_invalid_type_rejected(self):
         with pytest.raises(ValidationError, match="must be a valid integer"):
             InputValidator.validate_num_orders(
@@ -3,6 +3,7 @@ Unit tests for VWAPExecutor.
 """
 
 import pytest
+import numpy as np
 from unittest.mock import Mock, patch
 from queue import Queue
 
@@ -38,6 +39,7 @@ class TestVWAPExecutor:
         md.get_current_prices.return_value = {'bid': 49995, 'ask': 50005, 'mid': 50000}
         md.display_market_conditions.return_value = None
         md.round_size.side_effect = lambda s, pid: round(s, 8)
+        md.round_size_batch.side_effect = lambda sizes, pid: np.round(sizes, 8)
         md.round_price.side_effect = lambda p, pid: round(p, 2)
         return md
 
@@ -102,6 +104,31 @@ class TestVWAPExecutor:
         strategy = call_args[0][0] if call_args[0] else call_args[1].get('strategy')
         assert isinstance(strategy, VWAPStrategy)
 
+    def test_slice_sizes_rounded_in_one_batch(self, executor, mock_market_data, mock_twap_executor):
+        """Slice sizes should be rounded with a single batch call."""
+        mock_market_data.round_size_batch.side_effect = lambda sizes, pid: np.round(sizes, 1)
+        inputs = iter(['BUY', '50000', '1.0', '60', '3', '3', '24', 'yes'])
+        get_input = Mock(side_effect=inputs)
+
+        executor.place_vwap_order(get_input)
+
+        assert mock_market_data.round_size_batch.call_count == 1
+        mock_market_data.round_size.assert_not_called()
+        strategy = mock_twap_executor.execute_strategy.call_args[0][0]
+        assert [s.size for s in strategy._slices] == [0.3, 0.3, 0.3]
+        assert all(type(s.size) is float for s in strategy._slices)
+
+    def test_slice_below_product_minimum_aborts(self, executor, mock_api_client, mock_twap_executor):
+        """Slices smaller than the product minimum should stop the order before confirmation."""
+        mock_api_client.get_product.return_value = {'base_min_size': '0.5', 'base_max_size': '100'}
+        inputs = iter(['BUY', '50000', '1.0', '60', '5', '3', '24', 'yes'])
+        get_input = Mock(side_effect=inputs)
+
+        result = executor.place_vwap_order(get_input)
+
+        assert result is None
+        assert mock_twap_executor.execute_strategy.call_count == 0
+
     def test_display_vwap_summary_not_found(self, executor):
         """Displaying non-existent strategy should warn."""
         # Should not raise
@@ -156,3 +183,37 @@ class TestVWAPExecutor:
 
         result = executor.place_vwap_order(get_input)
         assert result is None
+
+    def test_display_volume_profile_table(self, executor, capsys):
+        """Volume profile preview should print one aligned row per slice."""
+        strategy = Mock(duration_minutes=60, num_slices=3, volume_profile=[0.2, 0.5, 0.3])
+        slices = [Mock(slice_number=i + 1, size=size) for i, size in enumerate([0.2, 0.5, 0.3])]
+
+        executor._display_volume_profile(strategy, slices, 'BTC-USDC', 'BUY', 1.0)
+
+        lines = capsys.readouterr().out.splitlines()
+        header = next(i for i, line in enumerate(lines) if 'Volume Weight' in line)
+        rows = lines[header + 2:header + 5]
+        assert rows[1].split() == ['2', '0.5000', '0.50000000', '50.0%', '#' * 20]
+        assert rows[0].split()[-1] == '#' * 8
+        assert len({len(line.rstrip('#')) for line in rows}) == 1
+
+    def test_invalid_price_type_and_lookback_reprompt(self, executor, mock_twap_executor):
+        """Bad price type and lookback answers should be asked again, not abort the order."""
+        inputs = iter(['BUY', '50000', '1.0', '60', '5', '9', ' 3 ', '500', 'abc', '', 'yes'])
+        get_input = Mock(side_effect=inputs)
+
+        result = executor.place_vwap_order(get_input)
+
+        assert result is not None
+        strategy = mock_twap_executor.execute_strategy.call_args[0][0]
+        assert strategy.vwap_config.price_type == 'mid'
+        assert strategy.vwap_config.volume_lookback_hours == 24
+
+    def test_non_numeric_lookback_message(self, capsys):
+        """A non-numeric lookback should print the friendly prompt error, not int()'s."""
+        from vwap_executor import _prompt, _parse_lookback
+
+        get_input = Mock(side_effect=['abc', '12'])
+        assert _prompt(get_input, "Lookback", _parse_lookback) == 12
+        assert "Invalid input: Please enter a valid number." in capsys.readouterr().out
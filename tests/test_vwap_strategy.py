@@ -3,8 +3,12 @@ Unit tests for VWAPStrategy.
 """
 
 import pytest
+import sys
 import time
-from unittest.mock import Mock
+from dataclasses import FrozenInstanceError
+from unittest.mock import Mock, patch
+import numpy as np
+import vwap_strategy
 from vwap_strategy import VWAPStrategy, VWAPStrategyConfig
 from order_strategy import StrategyStatus
 
@@ -149,6 +153,113 @@ class TestVWAPVolumeProfile:
         for size in sizes:
             assert abs(size - expected) < 1e-10
 
+    def test_candles_fetched_once_per_calculation(self):
+        """Volume profile and benchmark should share a single candle request."""
+        mock_api = Mock()
+        mock_api.get_candles.return_value = self._make_candles({h: 100.0 for h in range(24)})
+
+        strategy = VWAPStrategy(
+            product_id='BTC-USDC', side='BUY', total_size=1.0,
+            limit_price=50000, num_slices=5, duration_minutes=30,
+            api_client=mock_api
+        )
+        strategy.calculate_slices()
+
+        assert mock_api.get_candles.call_count == 1
+        assert strategy.benchmark_vwap > 0
+        assert strategy.get_performance_vs_benchmark()['benchmark_vwap'] == strategy.benchmark_vwap
+        assert mock_api.get_candles.call_count == 1
+
+    def test_benchmark_not_retried_without_data(self):
+        """An empty benchmark should be computed once, not on every access."""
+        mock_api = Mock()
+        mock_api.get_candles.return_value = []
+
+        strategy = VWAPStrategy(
+            product_id='BTC-USDC', side='BUY', total_size=1.0,
+            limit_price=50000, num_slices=5, duration_minutes=30,
+            api_client=mock_api
+        )
+        strategy.calculate_slices()
+        assert strategy.benchmark_vwap == 0.0
+        assert strategy.get_result().metadata['benchmark_vwap'] == 0.0
+        assert mock_api.get_candles.call_count == 1
+
+    def test_volume_profile_shared_across_strategies(self):
+        """A second strategy on the same product should reuse the cached profile."""
+        mock_api = Mock()
+        mock_api.get_candles.return_value = self._make_candles({h: 100.0 + h for h in range(24)})
+
+        def make_strategy():
+            return VWAPStrategy(
+                product_id='BTC-USDC', side='BUY', total_size=1.0,
+                limit_price=50000, num_slices=5, duration_minutes=30,
+                api_client=mock_api
+            )
+
+        first = make_strategy()
+        first.calculate_slices()
+        second = make_strategy()
+        second.calculate_slices()
+
+        assert mock_api.get_candles.call_count == 1
+        assert second.volume_profile == first.volume_profile
+        assert second.benchmark_vwap == first.benchmark_vwap
+
+    def test_volume_cache_expires(self):
+        """Cached profiles older than the TTL should be refetched."""
+        mock_api = Mock()
+        mock_api.get_candles.return_value = self._make_candles({h: 100.0 for h in range(24)})
+
+        def make_strategy(lookback=24):
+            return VWAPStrategy(
+                product_id='BTC-USDC', side='BUY', total_size=1.0,
+                limit_price=50000, num_slices=5, duration_minutes=30,
+                api_client=mock_api,
+                config=VWAPStrategyConfig(volume_lookback_hours=lookback)
+            )
+
+        make_strategy().calculate_slices()
+        # A different lookback is a different cache entry
+        make_strategy(lookback=48).calculate_slices()
+        assert mock_api.get_candles.call_count == 2
+
+        stale = time.monotonic() - vwap_strategy._VOLUME_CACHE_TTL - 1
+        for cache in (vwap_strategy._volume_cache, vwap_strategy._benchmark_cache):
+            for key, (_, value) in list(cache.items()):
+                cache[key] = (stale, value)
+
+        make_strategy().calculate_slices()
+        assert mock_api.get_candles.call_count == 3
+
+    def test_volume_cache_keyed_by_window_and_granularity(self):
+        """Strategies with different lookbacks or granularities should not share a profile."""
+        flat = self._make_candles({h: 100.0 for h in range(24)})
+        skewed = self._make_candles({h: 1000.0 if h % 2 else 1.0 for h in range(24)})
+        mock_api = Mock()
+        mock_api.get_candles.side_effect = [flat, skewed, skewed]
+
+        def make_strategy(**config):
+            return VWAPStrategy(
+                product_id='BTC-USDC', side='BUY', total_size=1.0,
+                limit_price=50000, num_slices=24, duration_minutes=24 * 60,
+                api_client=mock_api,
+                config=VWAPStrategyConfig(num_slices=24, duration_minutes=24 * 60, **config)
+            )
+
+        flat_strategy = make_strategy()
+        flat_strategy.calculate_slices()
+        long_strategy = make_strategy(volume_lookback_hours=48)
+        long_strategy.calculate_slices()
+        fine_strategy = make_strategy(granularity='FIFTEEN_MINUTE')
+        fine_strategy.calculate_slices()
+
+        assert mock_api.get_candles.call_count == 3
+        assert long_strategy.volume_profile != flat_strategy.volume_profile
+        assert fine_strategy.volume_profile != flat_strategy.volume_profile
+        assert {key[1:] for key in vwap_strategy._volume_cache} == {
+            ('ONE_HOUR', 24 * 3600), ('ONE_HOUR', 48 * 3600), ('FIFTEEN_MINUTE', 24 * 3600)}
+
 
 @pytest.mark.unit
 class TestVWAPBenchmark:
@@ -176,6 +287,69 @@ class TestVWAPBenchmark:
         expected = (50000 * 100 + 51000 * 200) / 300
         assert strategy.benchmark_vwap == pytest.approx(expected, rel=1e-4)
 
+    def test_benchmark_vwap_from_candle_objects(self):
+        """Candle objects with attributes should give the same benchmark as dicts."""
+        candles = [
+            Mock(start='1704067200', high='51000', low='49000', close='50000', volume='100'),
+            Mock(start='1704070800', high='52000', low='50000', close='51000', volume='200'),
+        ]
+
+        mock_api = Mock()
+        mock_api.get_candles.return_value = candles
+
+        strategy = VWAPStrategy(
+            product_id='BTC-USDC', side='BUY', total_size=1.0,
+            limit_price=50000, num_slices=2, duration_minutes=10,
+            api_client=mock_api
+        )
+        strategy.calculate_slices()
+
+        assert strategy.benchmark_vwap == pytest.approx((50000 * 100 + 51000 * 200) / 300)
+
+    def test_candle_missing_field_reads_as_zero(self):
+        """A candle without a volume field should count as zero volume."""
+        candles = [
+            {'start': '1704067200', 'high': '51000', 'low': '49000', 'close': '50000', 'volume': '100'},
+            {'start': '1704070800', 'high': '52000', 'low': '50000', 'close': '51000'},
+        ]
+
+        mock_api = Mock()
+        mock_api.get_candles.return_value = candles
+
+        strategy = VWAPStrategy(
+            product_id='BTC-USDC', side='BUY', total_size=1.0,
+            limit_price=50000, num_slices=2, duration_minutes=10,
+            api_client=mock_api
+        )
+        strategy.calculate_slices()
+
+        assert strategy.benchmark_vwap == pytest.approx(50000)
+
+    def test_candles_parsed_once_for_profile_and_benchmark(self):
+        """Profile and benchmark should share one parse of the candle batch."""
+        candles = [
+            {'start': '1704067200', 'high': '51000', 'low': '49000', 'close': '50000', 'volume': '100'},
+            {'start': '1704070800', 'high': '52000', 'low': '50000', 'close': '51000', 'volume': '200'},
+        ]
+        mock_api = Mock()
+        mock_api.get_candles.return_value = candles
+
+        strategy = VWAPStrategy(
+            product_id='BTC-USDC', side='BUY', total_size=1.0,
+            limit_price=50000, num_slices=2, duration_minutes=10,
+            api_client=mock_api
+        )
+        with patch('vwap_strategy._parse_candles', wraps=vwap_strategy._parse_candles) as parse:
+            strategy.calculate_slices()
+            benchmark = strategy.benchmark_vwap
+
+        assert parse.call_count == 1
+        assert benchmark == pytest.approx((50000 * 100 + 51000 * 200) / 300)
+        arrays = strategy._candle_arrays
+        assert arrays.starts.dtype == np.int64
+        assert arrays.starts.tolist() == [1704067200, 1704070800]
+        assert arrays.highs.flags['C_CONTIGUOUS']
+
     def test_benchmark_zero_with_no_candles(self):
         """Benchmark should be 0 if no candles available."""
         mock_api = Mock()
@@ -382,6 +556,44 @@ class TestVWAPBehavior:
         assert 'slippage_bps' in result.metadata
         assert 'volume_profile' in result.metadata
 
+    def test_get_result_totals_and_vwap(self):
+        """get_result totals and execution VWAP should come from the same fills."""
+        strategy = VWAPStrategy(
+            product_id='BTC-USDC', side='SELL', total_size=1.0,
+            limit_price=50000, num_slices=3, duration_minutes=10,
+            api_client=Mock()
+        )
+        strategy._benchmark_vwap = 50000.0
+        strategy.on_slice_complete(1, 'o1', {'filled_size': 0.2, 'price': 49900, 'fees': 1})
+        strategy.on_slice_complete(2, 'o2', {'filled_size': 0.3, 'price': 49800, 'fees': 2})
+        strategy.on_slice_complete(3, 'o3', {'filled_size': 0})
+
+        result = strategy.get_result()
+        expected_vwap = (0.2 * 49900 + 0.3 * 49800) / 0.5
+        assert result.total_filled == pytest.approx(0.5)
+        assert result.total_value == pytest.approx(0.2 * 49900 + 0.3 * 49800)
+        assert result.total_fees == 3
+        assert result.num_filled == 2
+        assert result.num_failed == 0
+        assert result.vwap == pytest.approx(expected_vwap)
+        assert strategy.get_execution_vwap() == pytest.approx(expected_vwap)
+        assert result.metadata['slippage_bps'] == pytest.approx((50000 - expected_vwap) / 50000 * 10000)
+
+    def test_fill_aggregates_refresh_after_slice_completes(self):
+        """Cached fill aggregates should be recomputed once another slice completes."""
+        strategy = VWAPStrategy(
+            product_id='BTC-USDC', side='BUY', total_size=1.0,
+            limit_price=50000, num_slices=2, duration_minutes=10,
+            api_client=Mock()
+        )
+        strategy.on_slice_complete(1, 'o1', {'filled_size': 0.5, 'price': 50000})
+        assert strategy.get_execution_vwap() == 50000
+        assert strategy._aggregate_fills() is strategy._aggregate_fills()
+
+        strategy.on_slice_complete(2, 'o2', {'filled_size': 0.5, 'price': 51000})
+        assert strategy.get_execution_vwap() == pytest.approx(50500)
+        assert strategy.get_result().num_filled == 2
+
     def test_correct_number_of_slices(self):
         """Should return exact number of slices requested."""
         mock_api = Mock()
@@ -395,3 +607,27 @@ class TestVWAPBehavior:
             )
             slices = strategy.calculate_slices()
             assert len(slices) == n
+
+
+@pytest.mark.unit
+class TestVWAPStrategyConfig:
+    """Tests for the VWAP strategy config."""
+
+    def test_config_is_frozen_and_hashable(self):
+        """Config should be immutable and usable as a dict key."""
+        config = VWAPStrategyConfig(num_slices=5)
+        with pytest.raises(FrozenInstanceError):
+            config.num_slices = 6
+        assert {config: 1}[VWAPStrategyConfig(num_slices=5)] == 1
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    def test_config_and_slices_have_no_instance_dict(self):
+        """Config and slice specs should be slotted."""
+        strategy = VWAPStrategy(
+            product_id='BTC-USDC', side='BUY', total_size=1.0,
+            limit_price=50000, num_slices=2, duration_minutes=10,
+            api_client=Mock(get_candles=Mock(return_value=[]))
+        )
+        slices = strategy.calculate_slices()
+        assert not hasattr(strategy.vwap_config, '__dict__')
+        assert not hasattr(slices[0], '__dict__')
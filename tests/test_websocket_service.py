@@ -40,28 +40,35 @@ class TestWebSocketService:
 
     def test_get_current_prices_stale(self, ws_service):
         """Stale prices should return None."""
-        ws_service._price_cache["BTC-USD"] = {
-            'bid': 50000.0,
-            'ask': 50010.0,
-            'mid': 50005.0,
-            'timestamp': time.time() - 100,  # Very old
-        }
+        ws_service._store_price("BTC-USD", 50000.0, 50010.0, 50005.0,
+                                time.monotonic() - 100)  # Very old
         assert ws_service.get_current_prices("BTC-USD") is None
 
     def test_get_current_prices_fresh(self, ws_service):
         """Fresh prices should be returned."""
-        ws_service._price_cache["BTC-USD"] = {
-            'bid': 50000.0,
-            'ask': 50010.0,
-            'mid': 50005.0,
-            'timestamp': time.time(),
-        }
+        ws_service._store_price("BTC-USD", 50000.0, 50010.0, 50005.0, time.monotonic())
         prices = ws_service.get_current_prices("BTC-USD")
         assert prices is not None
         assert prices['bid'] == 50000.0
         assert prices['ask'] == 50010.0
         assert prices['mid'] == 50005.0
 
+    def test_get_current_prices_many(self, ws_service):
+        """Batch lookup should return only fresh cached products."""
+        now = time.monotonic()
+        ws_service._store_price("BTC-USD", 50000.0, 50010.0, 50005.0, now)
+        ws_service._store_price("ETH-USD", 3000.0, 3002.0, 3001.0, now - 100)
+
+        prices = ws_service.get_current_prices_many(["BTC-USD", "ETH-USD", "SOL-USD"])
+
+        assert prices == {"BTC-USD": {'bid': 50000.0, 'ask': 50010.0, 'mid': 50005.0}}
+
+    def test_staleness_ignores_wall_clock_jumps(self, ws_service):
+        """A wall-clock jump should not make a fresh price look stale."""
+        ws_service._store_price("BTC-USD", 1.0, 3.0, 2.0, time.monotonic())
+        with patch('websocket_service.time.time', return_value=time.time() + 3600):
+            assert ws_service.get_current_prices("BTC-USD") is not None
+
 
 class TestTickerMessageHandling:
 
@@ -100,11 +107,33 @@ class TestTickerMessageHandling:
         assert ws_service.get_current_prices("ETH-USD") is not None
         assert len(ws_service.get_cached_products()) == 2
 
+    def test_many_products_across_shards(self, ws_service):
+        """Products spread over shards should all be cached and listed."""
+        tickers = [{'product_id': f'P{i}-USD', 'best_bid': str(i + 1), 'best_ask': str(i + 2)}
+                   for i in range(40)]
+        ws_service._handle_ticker_message(json.dumps({'channel': 'ticker', 'events': [{'tickers': tickers}]}))
+
+        assert sorted(ws_service.get_cached_products()) == sorted(t['product_id'] for t in tickers)
+        assert ws_service.get_current_prices('P7-USD')['bid'] == 8.0
+
     def test_non_ticker_channel_ignored(self, ws_service):
         msg = json.dumps({'channel': 'heartbeat', 'events': []})
         ws_service._handle_ticker_message(msg)
         assert ws_service.get_cached_products() == []
 
+    def test_non_ticker_message_not_parsed(self, ws_service):
+        """Messages without a ticker channel should be dropped before JSON parsing."""
+        with patch('websocket_service._loads') as loads:
+            ws_service._handle_ticker_message('{"channel":"heartbeats","events":[]}')
+            ws_service._handle_ticker_message(b'{"channel":"heartbeats","events":[]}')
+        loads.assert_not_called()
+
+    def test_ticker_prefilter_ignores_spacing(self, ws_service):
+        """The raw pre-filter should not depend on spacing around the channel key."""
+        msg = '{"channel" : "ticker", "events": [{"tickers": [{"product_id": "BTC-USD", "best_bid": "1", "best_ask": "3"}]}]}'
+        ws_service._handle_ticker_message(msg)
+        assert ws_service.get_current_prices("BTC-USD")['mid'] == 2.0
+
     def test_invalid_json(self, ws_service):
         ws_service._handle_ticker_message("not json")
         assert ws_service.get_cached_products() == []
@@ -124,6 +153,27 @@ class TestTickerMessageHandling:
         ws_service._handle_ticker_message(msg)
         assert ws_service.get_current_prices("SOL-USD") is not None
 
+    def test_bytes_message(self, ws_service):
+        """Should parse raw bytes messages without decoding them first."""
+        msg = json.dumps({
+            'channel': 'ticker',
+            'events': [{'tickers': [{'product_id': 'BTC-USD', 'best_bid': '100', 'best_ask': '102'}]}]
+        }).encode()
+        ws_service._handle_ticker_message(msg)
+        assert ws_service.get_current_prices("BTC-USD")['mid'] == 101.0
+
+    def test_stdlib_json_fallback(self, ws_service, monkeypatch):
+        """Should parse with the stdlib json module when orjson is unavailable."""
+        import websocket_service
+        monkeypatch.setattr(websocket_service, '_loads', json.loads)
+        msg = json.dumps({
+            'channel': 'ticker',
+            'events': [{'tickers': [{'product_id': 'ETH-USD', 'best_bid': '10', 'best_ask': '12'}]}]
+        })
+        ws_service._handle_ticker_message(msg)
+        ws_service._handle_ticker_message("not json")
+        assert ws_service.get_cached_products() == ['ETH-USD']
+
 
 class TestUserMessageHandling:
 
@@ -153,6 +203,17 @@ class TestUserMessageHandling:
         assert received[0]['order_id'] == 'order-123'
         assert received[0]['status'] == 'FILLED'
 
+    def test_fill_event_logged_on_module_logger(self, ws_service, caplog):
+        msg = json.dumps({
+            'channel': 'user',
+            'events': [{'type': 'update', 'orders': [{'order_id': 'order-456', 'status': 'FILLED'}]}]
+        })
+        with caplog.at_level('INFO', logger='websocket_service'):
+            ws_service._handle_user_message(msg)
+
+        assert any(r.name == 'websocket_service' and r.getMessage() == 'WS fill event: order-456'
+                   for r in caplog.records)
+
     def test_non_filled_order_ignored(self, ws_service):
         received = []
         ws_service.register_fill_callback(lambda e: received.append(e))
@@ -202,6 +263,78 @@ class TestUserMessageHandling:
         ws_service._handle_user_message(msg)
         assert len(received) == 1
 
+    def test_callback_can_register_callback(self, ws_service):
+        """A callback registering another callback should not deadlock or alter the current dispatch."""
+        received = []
+
+        def first(event):
+            ws_service.register_fill_callback(lambda e: received.append(('late', e['order_id'])))
+            received.append(('first', event['order_id']))
+
+        ws_service.register_fill_callback(first)
+        msg = json.dumps({
+            'channel': 'user',
+            'events': [{'type': 'update', 'orders': [{'order_id': 'o3', 'status': 'FILLED'}]}]
+        })
+        ws_service._handle_user_message(msg)
+
+        assert received == [('first', 'o3')]
+        assert len(ws_service._fill_callbacks) == 2
+
+    def test_fill_dispatched_on_worker_thread(self, ws_service):
+        """With the dispatcher running, callbacks should run off the calling thread."""
+        import threading
+        received = []
+        ws_service.register_fill_callback(lambda e: received.append((e['order_id'], threading.current_thread())))
+        ws_service._start_fill_dispatcher()
+
+        for order_id in ('o4', 'o5'):
+            ws_service._handle_user_message(json.dumps({
+                'channel': 'user',
+                'events': [{'type': 'update', 'orders': [{'order_id': order_id, 'status': 'FILLED'}]}]
+            }))
+        ws_service._fill_queue.join()
+
+        assert [order_id for order_id, _ in received] == ['o4', 'o5']
+        assert all(thread is not threading.current_thread() for _, thread in received)
+
+        ws_service.stop()
+        assert ws_service._fill_worker is None
+
+    def test_stop_with_full_queue_and_stuck_callback(self, ws_service):
+        """stop() should return even when the queue is full behind a stuck callback."""
+        import threading
+        release = threading.Event()
+        started = threading.Event()
+        received = []
+
+        def stuck(event):
+            started.set()
+            release.wait(10)
+            received.append(event['order_id'])
+
+        ws_service.register_fill_callback(stuck)
+        ws_service._start_fill_dispatcher()
+        old_queue = ws_service._fill_queue
+        old_queue.put_nowait({'order_id': 'first'})
+        assert started.wait(5)
+        while not old_queue.full():
+            old_queue.put_nowait({'order_id': 'queued'})
+
+        with patch.object(threading.Thread, 'join') as join:
+            ws_service.stop()
+        join.assert_called_once_with(timeout=5)
+        assert ws_service._fill_worker is None
+
+        # A later dispatcher gets its own queue, untouched by the old worker
+        ws_service._start_fill_dispatcher()
+        assert ws_service._fill_queue is not old_queue
+        ws_service._fill_queue.put_nowait({'order_id': 'new'})
+        release.set()
+        ws_service._fill_queue.join()
+        assert 'new' in received
+        ws_service.stop()
+
     def test_non_user_channel_ignored(self, ws_service):
         received = []
         ws_service.register_fill_callback(lambda e: received.append(e))
@@ -321,6 +454,22 @@ class TestWebSocketTickerEdgeCases:
         # Product was cached (float('NaN') doesn't throw ValueError)
         assert 'BTC-USD' in cached
 
+    def test_ticker_missing_side_skipped(self, ws_service):
+        """A ticker without both bid and ask should not overwrite the cache."""
+        ws_service._store_price('BTC-USD', 100.0, 101.0, 100.5, time.monotonic())
+        msg = json.dumps({
+            'channel': 'ticker',
+            'events': [{'tickers': [{'product_id': 'BTC-USD', 'best_bid': '90'}]}]
+        })
+        ws_service._handle_ticker_message(msg)
+        assert ws_service.get_current_prices('BTC-USD')['bid'] == 100.0
+
+    def test_ticker_null_events(self, ws_service):
+        """Null events or tickers should be ignored."""
+        ws_service._handle_ticker_message(json.dumps({'channel': 'ticker', 'events': None}))
+        ws_service._handle_ticker_message(json.dumps({'channel': 'ticker', 'events': [{'tickers': None}]}))
+        assert ws_service.get_cached_products() == []
+
     def test_get_cached_products_thread_safe(self, ws_service):
         """Concurrent update + read should not crash."""
         import threading
@@ -500,12 +500,19 @@ class TWAPExecutor:
                     logging.error(f"Error processing fills for order {order_id}: {str(e)}")
                     continue
 
-            twap_tracker.save_twap_fills(twap_id, fills)
+            # Only record totals for fills that actually reached storage
+            if not twap_tracker.save_twap_fills(twap_id, fills):
+                logging.error(f"Fills for TWAP {twap_id} were not saved; leaving order totals unchanged")
+                return False
+
             twap_order.total_filled = total_filled
             twap_order.total_value_filled = total_value_filled
             twap_order.total_fees = total_fees
             twap_order.maker_orders = maker_orders
             twap_order.taker_orders = taker_orders
+            trade_times = [fill.trade_time for fill in fills]
+            twap_order.first_fill_time = min(trade_times) if trade_times else None
+            twap_order.last_fill_time = max(trade_times) if trade_times else None
 
             if total_filled >= twap_order.total_size:
                 twap_order.status = 'completed'
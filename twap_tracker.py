@@ -1,13 +1,21 @@
+import hashlib
 import json
 import os
 import logging
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, fields
+
+import numpy as np
 
 from base_tracker import BaseOrderTracker
+from order_strategy import _SLOTS
 
-@dataclass
+@dataclass(**_SLOTS)
 class TWAPOrder:
     twap_id: str
     market: str
@@ -27,8 +35,10 @@ class TWAPOrder:
     taker_orders: int = 0
     failed_slices: List[int] = None
     slice_statuses: List[Dict] = None
+    first_fill_time: Optional[str] = None
+    last_fill_time: Optional[str] = None
 
-@dataclass
+@dataclass(**_SLOTS)
 class OrderFill:
     order_id: str
     trade_id: str
@@ -38,39 +48,210 @@ class OrderFill:
     is_maker: bool
     trade_time: str
 
+# Flat dataclasses are serialized with direct attribute reads rather than
+# dataclasses.asdict(), which recursively deep-copies every value.
+_ORDER_FIELDS = tuple(f.name for f in fields(TWAPOrder))
+
+def _order_to_dict(order: TWAPOrder) -> dict:
+    """Return the JSON-ready dict for a TWAPOrder."""
+    return {name: getattr(order, name) for name in _ORDER_FIELDS}
+
+def _fill_to_dict(fill: OrderFill) -> dict:
+    """Return the JSON-ready dict for an OrderFill."""
+    return {
+        'order_id': fill.order_id,
+        'trade_id': fill.trade_id,
+        'filled_size': fill.filled_size,
+        'price': fill.price,
+        'fee': fill.fee,
+        'is_maker': fill.is_maker,
+        'trade_time': fill.trade_time,
+    }
+
+def make_fee_fn(fee_tier: dict) -> Callable[[float, float, bool], float]:
+    """
+    Build a fee function for one fee tier.
+
+    The maker and taker rates are parsed once, so the returned
+    fee(size, price, is_maker) does no dict lookups or float conversions
+    when pricing a batch of fills against the same tier.
+    """
+    maker_rate = float(fee_tier['maker_fee_rate'])
+    taker_rate = float(fee_tier['taker_fee_rate'])
+
+    def fee(fill_size: float, fill_price: float, is_maker: bool) -> float:
+        return fill_size * fill_price * (maker_rate if is_maker else taker_rate)
+
+    return fee
+
+# Fill fields in column order. Fills are stored as line-delimited JSON (one
+# fill per line) so a new fill is a single append; statistics read the log
+# back into one list per field and aggregate whole columns at once.
+FILL_COLUMNS = ('order_id', 'trade_id', 'filled_size', 'price', 'fee', 'is_maker', 'trade_time')
+
+# Sidecar index record for a fills log: 8-byte digest of the child order ID,
+# then the byte offset and length of that fill's line.
+_FILL_INDEX_RECORD = struct.Struct('<8sQI')
+
+def _order_key(order_id: str) -> bytes:
+    """Return the fixed-width index key for a child order ID."""
+    return hashlib.blake2b(order_id.encode(), digest_size=8).digest()
+
+# The fill fields calculate_twap_statistics aggregates.
+STATS_COLUMNS = ('filled_size', 'price', 'fee', 'is_maker', 'trade_time')
+
+# Number of TWAPs whose statistics are memoized by TWAPTracker.
+STATS_CACHE_SIZE = 256
+
+# Upper bound on threads used to read order files in iter_twap_orders.
+ORDER_LOAD_WORKERS = 16
+
 class TWAPTracker(BaseOrderTracker):
     def __init__(self, base_path: str = "twap_data"):
         """Initialize TWAPTracker with base path for JSON storage."""
         super().__init__(base_path, ["orders", "fills"])
         self.orders_dir = self._get_subdir("orders")
         self.fills_dir = self._get_subdir("fills")
+        # twap_id -> (file signatures, stats); LRU-ordered, invalidated when
+        # the order or fills files change on disk.
+        self._stats_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._stats_lock = threading.Lock()
 
     def _get_order_path(self, twap_id: str) -> str:
         """Get the file path for a TWAP order JSON."""
         return self._get_path("orders", twap_id)
 
     def _get_fills_path(self, twap_id: str) -> str:
-        """Get the file path for a TWAP fills JSON."""
+        """Get the file path for a TWAP fills log (one JSON fill per line)."""
+        return self._get_path("fills", twap_id, ".jsonl")
+
+    def _get_fill_index_path(self, twap_id: str) -> str:
+        """Get the file path for the order_id -> line offset index of a fills log."""
+        return self._get_path("fills", twap_id, ".idx")
+
+    def _get_legacy_fills_path(self, twap_id: str) -> str:
+        """Get the file path for fills written as a single JSON document."""
         return self._get_path("fills", twap_id)
 
     def save_twap_order(self, twap_order: TWAPOrder):
         """Save or update a TWAP order to JSON."""
         try:
             order_path = self._get_order_path(twap_order.twap_id)
-            self._save_json(order_path, asdict(twap_order), f"TWAP order {twap_order.twap_id}")
+            self._save_json(order_path, _order_to_dict(twap_order), f"TWAP order {twap_order.twap_id}")
             logging.info(f"Saved TWAP order {twap_order.twap_id} to {order_path}")
         except Exception as e:
             logging.error(f"Error saving TWAP order: {str(e)}")
 
-    def save_twap_fills(self, twap_id: str, fills: List[OrderFill]):
-        """Save or update fills for a TWAP order."""
+    def save_twap_fills(self, twap_id: str, fills: List[OrderFill]) -> bool:
+        """Save or update fills for a TWAP order, replacing any existing fills. Returns success."""
         try:
-            fills_path = self._get_fills_path(twap_id)
-            fills_data = [asdict(fill) for fill in fills]
-            self._save_json(fills_path, fills_data, f"TWAP fills for {twap_id}")
+            self._write_twap_fills(twap_id, fills)
             logging.info(f"Saved {len(fills)} fills for TWAP {twap_id}")
         except Exception as e:
             logging.error(f"Error saving TWAP fills: {str(e)}")
+            return False
+
+        # Running totals on the order describe the replaced fills; rebuild
+        # them so the statistics fast path matches the new fills file.
+        order = self.get_twap_order(twap_id)
+        if order is not None and order.last_fill_time is not None:
+            self._reset_fill_totals(order)
+            for fill in fills:
+                self._fold_fill(order, fill)
+            self.save_twap_order(order)
+        return True
+
+    def _write_twap_fills(self, twap_id: str, fills: List[OrderFill]):
+        """Rewrite the fills log and its index, then drop any legacy fills file. Raises on failure."""
+        fills_path = self._get_fills_path(twap_id)
+        spans = self._save_json_lines(fills_path, (_fill_to_dict(fill) for fill in fills),
+                                      f"TWAP fills for {twap_id}")
+        self._write_atomic(self._get_fill_index_path(twap_id), b''.join(
+            _FILL_INDEX_RECORD.pack(_order_key(fill.order_id), offset, length)
+            for fill, (offset, length) in zip(fills, spans)))
+        legacy_path = self._get_legacy_fills_path(twap_id)
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+
+    def _append_twap_fill(self, twap_id: str, fill: OrderFill):
+        """
+        Append one fill to the TWAP's fills log without rewriting it.
+
+        This does not touch the order's running totals; use append_fill, which
+        keeps them in step with the log. A legacy single-document fills file is converted first. If it exists
+        but cannot be read, the append is refused (raising) and the file is
+        left untouched rather than replaced by a log without its fills.
+        """
+        if os.path.exists(self._get_legacy_fills_path(twap_id)):
+            try:
+                columns = self._legacy_fill_columns(twap_id, FILL_COLUMNS)
+            except Exception as e:
+                logging.error(f"Unreadable legacy fills for TWAP {twap_id}, not converting: {str(e)}")
+                raise
+            # Convert the old single-document file once, then append from then on.
+            existing = [OrderFill(*row) for row in zip(*(columns[name] for name in FILL_COLUMNS))] if columns else []
+            self._write_twap_fills(twap_id, existing)
+        offset, length = self._append_json_line(self._get_fills_path(twap_id), _fill_to_dict(fill),
+                                                f"TWAP fill for {twap_id}")
+        with open(self._get_fill_index_path(twap_id), 'ab') as f:
+            f.write(_FILL_INDEX_RECORD.pack(_order_key(fill.order_id), offset, length))
+
+    def _load_fill_index(self, twap_id: str) -> bytes:
+        """
+        Return the index of a fills log, rebuilding it if it is missing or stale.
+
+        The index is current when its last record ends exactly at the end of
+        the log; a crash between the log append and the index append, or a
+        log written before the index existed, fails that check.
+        """
+        fills_path = self._get_fills_path(twap_id)
+        index_path = self._get_fill_index_path(twap_id)
+        log_size = os.path.getsize(fills_path)
+        try:
+            with open(index_path, 'rb') as f:
+                index = f.read()
+        except FileNotFoundError:
+            index = None
+
+        if index is not None and len(index) % _FILL_INDEX_RECORD.size == 0:
+            if not index:
+                indexed_end = 0
+            else:
+                _, offset, length = _FILL_INDEX_RECORD.unpack_from(index, len(index) - _FILL_INDEX_RECORD.size)
+                indexed_end = offset + length
+            if indexed_end == log_size:
+                return index
+
+        logging.info(f"Rebuilding fill index for TWAP {twap_id}")
+        index = b''.join(
+            _FILL_INDEX_RECORD.pack(_order_key(record['order_id']), offset, length)
+            for offset, length, record in self._iter_json_line_spans(fills_path))
+        self._write_atomic(index_path, index)
+        return index
+
+    def get_fills_for_order(self, twap_id: str, order_id: str) -> List[OrderFill]:
+        """Retrieve the fills of one child order, reading only its lines via the fill index."""
+        fills_path = self._get_fills_path(twap_id)
+        if not os.path.exists(fills_path):
+            return [fill for fill in self.get_twap_fills(twap_id) if fill.order_id == order_id]
+
+        try:
+            key = _order_key(order_id)
+            spans = [(offset, length)
+                     for digest, offset, length in _FILL_INDEX_RECORD.iter_unpack(self._load_fill_index(twap_id))
+                     if digest == key]
+            fills = []
+            with open(fills_path, 'rb') as f:
+                for offset, length in spans:
+                    f.seek(offset)
+                    record = self._decode_json_line(f.read(length))
+                    # Digests can collide; the stored order ID is authoritative.
+                    if record['order_id'] == order_id:
+                        fills.append(OrderFill(**record))
+            return fills
+        except Exception as e:
+            logging.error(f"Error reading fills for order {order_id}: {str(e)}")
+            return []
 
     def get_twap_order(self, twap_id: str) -> Optional[TWAPOrder]:
         """Retrieve a TWAP order from JSON."""
@@ -83,13 +264,61 @@ class TWAPTracker(BaseOrderTracker):
             logging.error(f"Error constructing TWAP order: {str(e)}")
             return None
 
+    def _load_fill_columns(self, twap_id: str,
+                           names: Tuple[str, ...] = FILL_COLUMNS) -> Optional[Dict[str, list]]:
+        """
+        Load the named fill fields for a TWAP as a dict of columns.
+
+        The fills log is read one line at a time and only the requested
+        fields are kept, so no per-fill objects outlive the read.
+        Returns None if the TWAP has no stored fills.
+        """
+        fills_path = self._get_fills_path(twap_id)
+        try:
+            if os.path.exists(fills_path):
+                columns = {name: [] for name in names}
+                appenders = [columns[name].append for name in names]
+                for record in self._iter_json_lines(fills_path, f"TWAP fills for {twap_id}"):
+                    for name, append in zip(names, appenders):
+                        append(record[name])
+                return columns
+
+            return self._legacy_fill_columns(twap_id, names)
+        except Exception as e:
+            logging.error(f"Error reading TWAP fill columns: {str(e)}")
+            return None
+
+    def _legacy_fill_columns(self, twap_id: str, names: Tuple[str, ...]) -> Optional[Dict[str, list]]:
+        """
+        Load fill columns from a legacy single-document fills file.
+
+        Returns None if there is no such file; raises if it exists but cannot
+        be read or parsed.
+        """
+        data = self._read_json(self._get_legacy_fills_path(twap_id))
+        if data is None:
+            return None
+        if isinstance(data, list):
+            return {name: [fill[name] for fill in data] for name in names}
+        return {name: data[name] for name in names}
+
+    def iter_twap_fills(self, twap_id: str) -> Iterator[OrderFill]:
+        """Yield the fills for a TWAP order one at a time, streaming the fills log."""
+        fills_path = self._get_fills_path(twap_id)
+        if os.path.exists(fills_path):
+            for record in self._iter_json_lines(fills_path, f"TWAP fills for {twap_id}"):
+                yield OrderFill(**record)
+            return
+
+        columns = self._load_fill_columns(twap_id)
+        if columns is not None:
+            for row in zip(*(columns[name] for name in FILL_COLUMNS)):
+                yield OrderFill(*row)
+
     def get_twap_fills(self, twap_id: str) -> List[OrderFill]:
         """Retrieve fills for a TWAP order."""
-        data = self._load_json(self._get_fills_path(twap_id), f"TWAP fills for {twap_id}")
-        if data is None:
-            return []
         try:
-            return [OrderFill(**fill_data) for fill_data in data]
+            return list(self.iter_twap_fills(twap_id))
         except Exception as e:
             logging.error(f"Error constructing TWAP fills: {str(e)}")
             return []
@@ -98,8 +327,18 @@ class TWAPTracker(BaseOrderTracker):
         """List all TWAP order IDs."""
         return self._list_ids("orders")
 
+    def iter_twap_orders(self) -> Iterator[TWAPOrder]:
+        """Yield every stored TWAP order, reading the order files concurrently."""
+        twap_ids = self.list_twap_orders()
+        if not twap_ids:
+            return
+        with ThreadPoolExecutor(max_workers=min(ORDER_LOAD_WORKERS, len(twap_ids))) as pool:
+            for order in pool.map(self.get_twap_order, twap_ids):
+                if order is not None:
+                    yield order
+
     def calculate_fee(self, fill_size: float, fill_price: float, fee_tier: dict, is_maker: bool) -> float:
-        """Calculate fee for a fill based on fee tier."""
+        """Calculate fee for a fill based on fee tier. For many fills, use make_fee_fn."""
         try:
             rate = float(fee_tier['maker_fee_rate']) if is_maker else float(fee_tier['taker_fee_rate'])
             return fill_size * fill_price * rate
@@ -107,36 +346,143 @@ class TWAPTracker(BaseOrderTracker):
             logging.error(f"Error calculating fee: {str(e)}")
             return 0.0
 
-    def calculate_twap_statistics(self, twap_id: str) -> dict:
-        """Calculate comprehensive statistics for a TWAP order."""
+    def append_fill(self, twap_id: str, fill: OrderFill):
+        """Append a single fill and fold it into the order's running totals."""
+        try:
+            order = self.get_twap_order(twap_id)
+            if not order:
+                logging.error(f"Cannot append fill: TWAP order {twap_id} not found")
+                return
+
+            # Running totals are only trusted once last_fill_time is set; seed
+            # them from any fills saved before the order was tracked this way.
+            if order.last_fill_time is None:
+                self._reset_fill_totals(order)
+                for existing in self.get_twap_fills(twap_id):
+                    self._fold_fill(order, existing)
+
+            self._append_twap_fill(twap_id, fill)
+            self._fold_fill(order, fill)
+            self.save_twap_order(order)
+        except Exception as e:
+            logging.error(f"Error appending TWAP fill: {str(e)}")
+
+    @staticmethod
+    def _reset_fill_totals(order: TWAPOrder):
+        """Zero the running fill totals stored on the order."""
+        order.total_filled = order.total_value_filled = order.total_fees = 0.0
+        order.maker_orders = order.taker_orders = 0
+        order.first_fill_time = order.last_fill_time = None
+
+    @staticmethod
+    def _fold_fill(order: TWAPOrder, fill: OrderFill):
+        """Add one fill to the running totals stored on the order."""
+        order.total_filled += fill.filled_size
+        order.total_value_filled += fill.filled_size * fill.price
+        order.total_fees += fill.fee
+        if fill.is_maker:
+            order.maker_orders += 1
+        else:
+            order.taker_orders += 1
+        if order.first_fill_time is None or fill.trade_time < order.first_fill_time:
+            order.first_fill_time = fill.trade_time
+        if order.last_fill_time is None or fill.trade_time > order.last_fill_time:
+            order.last_fill_time = fill.trade_time
+
+    @staticmethod
+    def _file_signature(path: str) -> Optional[tuple]:
+        """Return (mtime_ns, size) for a file, or None if it does not exist."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def calculate_twap_statistics(self, twap_id: str, verify: bool = False) -> dict:
+        """
+        Calculate comprehensive statistics for a TWAP order.
+
+        Orders carrying running fill totals (last_fill_time set) are answered
+        from the order record without reading the fills file. Pass verify=True
+        to recompute everything from the stored fills instead.
+
+        Results are memoized per TWAP until its order or fills file changes.
+        """
+        if verify:
+            return self._compute_twap_statistics(twap_id, verify=True)
+
+        signature = (
+            self._file_signature(self._get_order_path(twap_id)),
+            self._file_signature(self._get_fills_path(twap_id)),
+            self._file_signature(self._get_legacy_fills_path(twap_id)),
+        )
+        with self._stats_lock:
+            cached = self._stats_cache.get(twap_id)
+            if cached is not None and cached[0] == signature:
+                self._stats_cache.move_to_end(twap_id)
+                return dict(cached[1])
+
+        stats = self._compute_twap_statistics(twap_id)
+
+        with self._stats_lock:
+            self._stats_cache[twap_id] = (signature, stats)
+            self._stats_cache.move_to_end(twap_id)
+            while len(self._stats_cache) > STATS_CACHE_SIZE:
+                self._stats_cache.popitem(last=False)
+        return dict(stats)
+
+    def _compute_twap_statistics(self, twap_id: str, verify: bool = False) -> dict:
+        """Build the statistics dict for calculate_twap_statistics."""
         order = self.get_twap_order(twap_id)
         if not order:
             return {}
 
-        fills = self.get_twap_fills(twap_id)
+        if not verify and order.last_fill_time is not None:
+            total_filled = order.total_filled
+            total_value_filled = order.total_value_filled
+            total_fees = order.total_fees
+            maker_fills = order.maker_orders
+            taker_fills = order.taker_orders
+            first_fill_time = order.first_fill_time
+            last_fill_time = order.last_fill_time
+        else:
+            columns = self._load_fill_columns(twap_id, STATS_COLUMNS) or {name: [] for name in STATS_COLUMNS}
+            sizes = np.asarray(columns['filled_size'], dtype=np.float64)
+            prices = np.asarray(columns['price'], dtype=np.float64)
+            fees = np.asarray(columns['fee'], dtype=np.float64)
+            is_maker = np.asarray(columns['is_maker'], dtype=np.bool_)
+            trade_times = columns['trade_time']
+
+            total_filled = float(sizes.sum())
+            total_value_filled = float(np.dot(sizes, prices))
+            total_fees = float(fees.sum())
+            maker_fills = int(is_maker.sum())
+            taker_fills = len(is_maker) - maker_fills
+            first_fill_time = min(trade_times) if trade_times else None
+            last_fill_time = max(trade_times) if trade_times else None
 
         stats = {
             'twap_id': twap_id,
             'market': order.market,
             'side': order.side,
             'total_size': order.total_size,
-            'total_filled': sum(fill.filled_size for fill in fills),
-            'total_value_filled': sum(fill.filled_size * fill.price for fill in fills),
-            'total_fees': sum(fill.fee for fill in fills),
-            'maker_fills': sum(1 for fill in fills if fill.is_maker),
-            'taker_fills': sum(1 for fill in fills if not fill.is_maker),
-            'num_fills': len(fills),
+            'total_filled': total_filled,
+            'total_value_filled': total_value_filled,
+            'total_fees': total_fees,
+            'maker_fills': maker_fills,
+            'taker_fills': taker_fills,
+            'num_fills': maker_fills + taker_fills,
             'completion_rate': 0.0,
             'average_price': 0.0,
             'vwap': 0.0
         }
 
-        if stats['total_filled'] > 0:
-            stats['completion_rate'] = (stats['total_filled'] / order.total_size) * 100
-            stats['vwap'] = stats['total_value_filled'] / stats['total_filled']
+        if total_filled > 0:
+            stats['completion_rate'] = (total_filled / order.total_size) * 100
+            stats['vwap'] = total_value_filled / total_filled
 
-        if fills:
-            stats['first_fill_time'] = min(fill.trade_time for fill in fills)
-            stats['last_fill_time'] = max(fill.trade_time for fill in fills)
+        if last_fill_time is not None:
+            stats['first_fill_time'] = first_fill_time
+            stats['last_fill_time'] = last_fill_time
 
         return stats
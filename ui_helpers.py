@@ -1,8 +1,29 @@
 """
 UI Helper utilities for terminal color output and formatting.
+
+Color is applied only when stdout is a terminal and NO_COLOR is unset;
+piped or redirected output gets plain text. set_color_enabled() overrides
+the detected setting.
 """
+import os
+import sys
+from functools import lru_cache
+
 from colorama import Fore, Style, init
 
+
+def _stdout_supports_color() -> bool:
+    """Return True if stdout is an interactive terminal and NO_COLOR is not set."""
+    if os.environ.get('NO_COLOR') is not None:
+        return False
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+_COLOR_ENABLED = _stdout_supports_color()
+
 # Initialize colorama for cross-platform support
 init(autoreset=True)
 
@@ -19,10 +40,37 @@ class Colors:
     RESET = Style.RESET_ALL
 
 
+# Escape sequences bound once at import; the wrappers below are called in
+# table and progress loops, so they avoid per-call attribute lookups.
+_RESET = Style.RESET_ALL
+_SUCCESS_PRE = Colors.SUCCESS
+_ERROR_PRE = Colors.ERROR
+_WARNING_PRE = Colors.WARNING
+_INFO_PRE = Colors.INFO
+_HIGHLIGHT_PRE = Colors.HIGHLIGHT
+_BRIGHT_PRE = Colors.BRIGHT
+
+
+def set_color_enabled(enabled: bool) -> None:
+    """
+    Turn colored output on or off, overriding terminal detection.
+
+    Args:
+        enabled: True to emit ANSI color codes, False for plain text
+    """
+    global _COLOR_ENABLED
+    _COLOR_ENABLED = enabled
+    color_text.cache_clear()
+
+
+@lru_cache(maxsize=1024)
 def color_text(text: str, color: str) -> str:
     """
     Wrap text with color codes.
 
+    Cached, since most callers colorize a small set of repeated labels
+    (sides, statuses).
+
     Args:
         text: Text to colorize
         color: Color constant from Colors class
@@ -30,37 +78,60 @@ def color_text(text: str, color: str) -> str:
     Returns:
         Colored text string
     """
-    return f"{color}{text}{Style.RESET_ALL}"
+    if not _COLOR_ENABLED:
+        return text
+    return color + text + _RESET
 
 
 def success(text: str) -> str:
     """Return green text for success messages."""
-    return color_text(text, Colors.SUCCESS)
+    if not _COLOR_ENABLED:
+        return text
+    return _SUCCESS_PRE + text + _RESET
 
 
 def error(text: str) -> str:
     """Return red text for error messages."""
-    return color_text(text, Colors.ERROR)
+    if not _COLOR_ENABLED:
+        return text
+    return _ERROR_PRE + text + _RESET
 
 
 def warning(text: str) -> str:
     """Return yellow text for warning messages."""
-    return color_text(text, Colors.WARNING)
+    if not _COLOR_ENABLED:
+        return text
+    return _WARNING_PRE + text + _RESET
 
 
 def info(text: str) -> str:
     """Return cyan text for informational messages."""
-    return color_text(text, Colors.INFO)
+    if not _COLOR_ENABLED:
+        return text
+    return _INFO_PRE + text + _RESET
 
 
 def highlight(text: str) -> str:
     """Return magenta text for highlighted content."""
-    return color_text(text, Colors.HIGHLIGHT)
+    if not _COLOR_ENABLED:
+        return text
+    return _HIGHLIGHT_PRE + text + _RESET
 
 
 def bright(text: str) -> str:
     """Return bright text."""
-    return color_text(text, Colors.BRIGHT)
+    if not _COLOR_ENABLED:
+        return text
+    return _BRIGHT_PRE + text + _RESET
+
+
+# (prefix, suffix) keyed by the sign of a value: gains green, losses red,
+# zero uncolored.
+_SIGN_WRAP = {
+    1: (_SUCCESS_PRE, _RESET),
+    -1: (_ERROR_PRE, _RESET),
+    0: ('', ''),
+}
 
 
 def format_currency(amount: float, colored: bool = True) -> str:
@@ -76,15 +147,11 @@ def format_currency(amount: float, colored: bool = True) -> str:
     """
     formatted = f"${amount:,.2f}"
 
-    if not colored:
+    if not colored or not _COLOR_ENABLED:
         return formatted
 
-    if amount > 0:
-        return success(formatted)
-    elif amount < 0:
-        return error(formatted)
-    else:
-        return formatted
+    prefix, suffix = _SIGN_WRAP[(amount > 0) - (amount < 0)]
+    return prefix + formatted + suffix
 
 
 def format_percentage(value: float, colored: bool = True) -> str:
@@ -100,15 +167,30 @@ def format_percentage(value: float, colored: bool = True) -> str:
     """
     formatted = f"{value:+.2f}%"
 
-    if not colored:
+    if not colored or not _COLOR_ENABLED:
         return formatted
 
-    if value > 0:
-        return success(formatted)
-    elif value < 0:
-        return error(formatted)
-    else:
-        return formatted
+    prefix, suffix = _SIGN_WRAP[(value > 0) - (value < 0)]
+    return prefix + formatted + suffix
+
+
+_SIDE_COLORS = {
+    'BUY': Colors.SUCCESS,
+    'SELL': Colors.ERROR,
+}
+
+_STATUS_COLORS = {
+    'FILLED': Colors.SUCCESS,
+    'COMPLETED': Colors.SUCCESS,
+    'SUCCESS': Colors.SUCCESS,
+    'CANCELLED': Colors.ERROR,
+    'REJECTED': Colors.ERROR,
+    'FAILED': Colors.ERROR,
+    'EXPIRED': Colors.ERROR,
+    'PENDING': Colors.WARNING,
+    'OPEN': Colors.WARNING,
+    'ACTIVE': Colors.WARNING,
+}
 
 
 def format_side(side: str) -> str:
@@ -121,12 +203,8 @@ def format_side(side: str) -> str:
     Returns:
         Colored side string
     """
-    if side.upper() == 'BUY':
-        return success(side)
-    elif side.upper() == 'SELL':
-        return error(side)
-    else:
-        return side
+    color = _SIDE_COLORS.get(side.upper())
+    return color_text(side, color) if color else side
 
 
 def format_status(status: str) -> str:
@@ -139,16 +217,8 @@ def format_status(status: str) -> str:
     Returns:
         Colored status string
     """
-    status_upper = status.upper()
-
-    if status_upper in ['FILLED', 'COMPLETED', 'SUCCESS']:
-        return success(status)
-    elif status_upper in ['CANCELLED', 'REJECTED', 'FAILED', 'EXPIRED']:
-        return error(status)
-    elif status_upper in ['PENDING', 'OPEN', 'ACTIVE']:
-        return warning(status)
-    else:
-        return status
+    color = _STATUS_COLORS.get(status.upper())
+    return color_text(status, color) if color else status
 
 
 def print_header(text: str):
@@ -16,7 +16,9 @@ Usage:
 """
 
 import logging
-from typing import Optional
+from typing import FrozenSet, Optional
+
+import numpy as np
 
 
 class ValidationError(Exception):
@@ -26,23 +28,102 @@ class ValidationError(Exception):
     This exception provides a user-friendly error message explaining
     what validation failed and how to fix it.
 
+    The message may be given as a ``(template, args)`` tuple, in which case
+    it is only formatted when read. Validators use this so that failures
+    caught and retried by input loops don't pay for string formatting.
+
     Attributes:
         message: Human-readable description of the validation failure.
         field: Optional name of the field that failed validation.
         value: Optional value that was rejected.
     """
 
-    def __init__(self, message: str, field: Optional[str] = None, value=None):
-        self.message = message
+    __slots__ = ("_template", "_args", "field", "value")
+
+    def __init__(self, message, field: Optional[str] = None, value=None):
+        if isinstance(message, tuple):
+            self._template, self._args = message
+        else:
+            self._template, self._args = message, ()
         self.field = field
         self.value = value
-        super().__init__(self.message)
+        super().__init__()
+
+    @property
+    def message(self) -> str:
+        if self._args:
+            return self._template.format(*self._args)
+        return self._template
+
+    @property
+    def args(self) -> tuple:
+        # Formatted on read, like message, so args and repr never show the raw template
+        return (self.message,)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.message!r})"
 
     def __str__(self) -> str:
         if self.field:
             return f"{self.field}: {self.message}"
         return self.message
 
+    def __reduce__(self):
+        return (self.__class__, ((self._template, self._args), self.field, self.value))
+
+
+# Relative tolerance for split-size checks, so exact splits such as 0.35 into
+# 35 slices of 0.01 are not rejected over float rounding.
+_SIZE_RTOL = 1e-9
+
+_VALID_SIDES: FrozenSet[str] = frozenset({'BUY', 'SELL'})
+_VALID_PRICE_TYPES: FrozenSet[str] = frozenset({'1', '2', '3', '4'})
+_PRICE_TYPE_ERR = (
+    "Price type must be 1, 2, 3, or 4:\n"
+    "  1 = Original limit price\n"
+    "  2 = Current market bid\n"
+    "  3 = Current market mid\n"
+    "  4 = Current market ask"
+)
+
+# Raw input -> normalized result for product IDs and sides that passed
+# validation; these come from a small set of values, so cache the success
+# path. Filling stops at the size limit rather than evicting.
+_VALIDATED_CACHE_SIZE = 256
+_valid_product_ids: dict = {}
+_valid_sides: dict = {}
+
+
+def _to_float(value, field: str, label: str) -> float:
+    """Convert a numeric input to float, skipping the conversion for floats."""
+    t = type(value)
+    if t is float:
+        return value
+    if t is int:
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValidationError(
+            (label + " must be a valid number, got: {}", (t.__name__,)),
+            field=field,
+            value=value
+        )
+
+
+def _to_int(value, field: str, label: str) -> int:
+    """Convert a numeric input to int, skipping the conversion for ints."""
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(
+            (label + " must be a valid integer, got: {}", (type(value).__name__,)),
+            field=field,
+            value=value
+        )
+
 
 class InputValidator:
     """
@@ -82,14 +163,7 @@ class InputValidator:
             >>> InputValidator.validate_price(0)
             ValidationError: Price must be greater than 0
         """
-        try:
-            price = float(price)
-        except (TypeError, ValueError):
-            raise ValidationError(
-                f"Price must be a valid number, got: {type(price).__name__}",
-                field="price",
-                value=price
-            )
+        price = _to_float(price, "price", "Price")
 
         if price <= 0:
             raise ValidationError(
@@ -100,7 +174,7 @@ class InputValidator:
 
         if price < min_price:
             raise ValidationError(
-                f"Price must be at least {min_price}",
+                ("Price must be at least {}", (min_price,)),
                 field="price",
                 value=price
             )
@@ -129,14 +203,7 @@ class InputValidator:
             >>> InputValidator.validate_size(0.0001, min_size=0.001, max_size=100)
             ValidationError: Size must be at least 0.001
         """
-        try:
-            size = float(size)
-        except (TypeError, ValueError):
-            raise ValidationError(
-                f"Size must be a valid number, got: {type(size).__name__}",
-                field="size",
-                value=size
-            )
+        size = _to_float(size, "size", "Size")
 
         if size <= 0:
             raise ValidationError(
@@ -147,20 +214,56 @@ class InputValidator:
 
         if size < min_size:
             raise ValidationError(
-                f"Size must be at least {min_size}",
+                ("Size must be at least {}", (min_size,)),
                 field="size",
                 value=size
             )
 
         if size > max_size:
             raise ValidationError(
-                f"Size cannot exceed {max_size}",
+                ("Size cannot exceed {}", (max_size,)),
                 field="size",
                 value=size
             )
 
         return size
 
+    @staticmethod
+    def validate_sizes(sizes, min_size: float, max_size: float) -> np.ndarray:
+        """
+        Validate a batch of order sizes, such as the slices of a TWAP/VWAP order.
+
+        Args:
+            sizes: Sequence or array of order sizes.
+            min_size: Minimum order size (from product specification).
+            max_size: Maximum order size (from product specification).
+
+        Returns:
+            The sizes as a float64 array.
+
+        Raises:
+            ValidationError: Naming the first size outside the valid range.
+
+        Example:
+            >>> InputValidator.validate_sizes([0.5, 0.25], min_size=0.001, max_size=100)
+            array([0.5 , 0.25])
+            >>> InputValidator.validate_sizes([0.5, 0.0001], min_size=0.001, max_size=100)
+            ValidationError: Size at index 1 (0.0001) must be between 0.001 and 100
+        """
+        sizes = np.asarray(sizes, dtype=np.float64)
+        # Written as a negated "in range" test so NaN sizes are rejected too.
+        bad = ~((sizes > 0) & (sizes >= min_size) & (sizes <= max_size))
+        if bad.any():
+            idx = int(bad.argmax())
+            size = float(sizes[idx])
+            raise ValidationError(
+                ("Size at index {} ({}) must be between {} and {}", (idx, size, min_size, max_size)),
+                field="size",
+                value=size
+            )
+
+        return sizes
+
     @staticmethod
     def validate_twap_duration(
         duration: int,
@@ -187,26 +290,18 @@ class InputValidator:
             >>> InputValidator.validate_twap_duration(0)
             ValidationError: Duration must be at least 1 minute(s)
         """
-        try:
-            duration = int(duration)
-        except (TypeError, ValueError):
-            raise ValidationError(
-                f"Duration must be a valid integer, got: {type(duration).__name__}",
-                field="duration",
-                value=duration
-            )
+        duration = _to_int(duration, "duration", "Duration")
 
         if duration < min_duration:
             raise ValidationError(
-                f"Duration must be at least {min_duration} minute(s)",
+                ("Duration must be at least {} minute(s)", (min_duration,)),
                 field="duration",
                 value=duration
             )
 
         if duration > max_duration:
-            hours = max_duration // 60
             raise ValidationError(
-                f"Duration cannot exceed {max_duration} minutes ({hours} hours)",
+                ("Duration cannot exceed {} minutes ({} hours)", (max_duration, max_duration // 60)),
                 field="duration",
                 value=duration
             )
@@ -246,14 +341,7 @@ class InputValidator:
             >>> InputValidator.validate_num_slices(200, total_size=1.0, min_size=0.01)
             ValidationError: Slice size (0.005) would be below minimum (0.01)
         """
-        try:
-            num_slices = int(num_slices)
-        except (TypeError, ValueError):
-            raise ValidationError(
-                f"Number of slices must be a valid integer, got: {type(num_slices).__name__}",
-                field="num_slices",
-                value=num_slices
-            )
+        num_slices = _to_int(num_slices, "num_slices", "Number of slices")
 
         if num_slices < 1:
             raise ValidationError(
@@ -264,18 +352,18 @@ class InputValidator:
 
         if num_slices > max_slices:
             raise ValidationError(
-                f"Number of slices cannot exceed {max_slices}",
+                ("Number of slices cannot exceed {}", (max_slices,)),
                 field="num_slices",
                 value=num_slices
             )
 
-        # Calculate slice size and validate
-        slice_size = total_size / num_slices
-        if slice_size < min_size:
-            max_valid_slices = int(total_size / min_size)
+        # Validate slice size; the division is only needed for the error message
+        if total_size < min_size * num_slices * (1 - _SIZE_RTOL):
+            slice_size = total_size / num_slices
+            max_valid_slices = int(total_size / min_size * (1 + _SIZE_RTOL))
             raise ValidationError(
-                f"Slice size ({slice_size:.8f}) would be below minimum ({min_size}). "
-                f"Reduce number of slices to at most {max_valid_slices}",
+                ("Slice size ({:.8f}) would be below minimum ({}). "
+                 "Reduce number of slices to at most {}", (slice_size, min_size, max_valid_slices)),
                 field="num_slices",
                 value=num_slices
             )
@@ -302,21 +390,30 @@ class InputValidator:
             >>> InputValidator.validate_side('hold')
             ValidationError: Side must be 'buy' or 'sell'
         """
+        if type(side) is str:
+            cached = _valid_sides.get(side)
+            if cached is not None:
+                return cached
+
         if not isinstance(side, str):
             raise ValidationError(
-                f"Side must be a string, got: {type(side).__name__}",
+                ("Side must be a string, got: {}", (type(side).__name__,)),
                 field="side",
                 value=side
             )
 
-        side_upper = side.upper().strip()
-        if side_upper not in ('BUY', 'SELL'):
+        side_upper = side.strip()
+        if not side_upper.isupper():
+            side_upper = side_upper.upper()
+        if side_upper not in _VALID_SIDES:
             raise ValidationError(
                 "Side must be 'buy' or 'sell'",
                 field="side",
                 value=side
             )
 
+        if len(_valid_sides) < _VALIDATED_CACHE_SIZE:
+            _valid_sides[side] = side_upper
         return side_upper
 
     @staticmethod
@@ -341,31 +438,38 @@ class InputValidator:
             >>> InputValidator.validate_product_id('BTCUSD')
             ValidationError: Product ID must be in format 'BASE-QUOTE'
         """
+        if type(product_id) is str:
+            cached = _valid_product_ids.get(product_id)
+            if cached is not None:
+                return cached
+
         if not isinstance(product_id, str):
             raise ValidationError(
-                f"Product ID must be a string, got: {type(product_id).__name__}",
+                ("Product ID must be a string, got: {}", (type(product_id).__name__,)),
                 field="product_id",
                 value=product_id
             )
 
-        product_id = product_id.upper().strip()
+        raw_product_id = product_id
+        product_id = product_id.strip()
+        if not product_id.isupper():
+            product_id = product_id.upper()
 
-        if '-' not in product_id:
+        base, sep, quote = product_id.partition('-')
+        if not sep:
             raise ValidationError(
                 "Product ID must be in format 'BASE-QUOTE' (e.g., 'BTC-USD')",
                 field="product_id",
                 value=product_id
             )
 
-        parts = product_id.split('-')
-        if len(parts) != 2:
+        if '-' in quote:
             raise ValidationError(
                 "Product ID must have exactly one '-' separator",
                 field="product_id",
                 value=product_id
             )
 
-        base, quote = parts
         if not base or not quote:
             raise ValidationError(
                 "Product ID must have both base and quote currencies",
@@ -373,6 +477,8 @@ class InputValidator:
                 value=product_id
             )
 
+        if len(_valid_product_ids) < _VALIDATED_CACHE_SIZE:
+            _valid_product_ids[raw_product_id] = product_id
         return product_id
 
     @staticmethod
@@ -395,20 +501,14 @@ class InputValidator:
             >>> InputValidator.validate_price_type('5')
             ValidationError: Price type must be 1, 2, 3, or 4
         """
-        valid_types = ('1', '2', '3', '4')
-
         if not isinstance(price_type, str):
             price_type = str(price_type)
 
         price_type = price_type.strip()
 
-        if price_type not in valid_types:
+        if price_type not in _VALID_PRICE_TYPES:
             raise ValidationError(
-                "Price type must be 1, 2, 3, or 4:\n"
-                "  1 = Original limit price\n"
-                "  2 = Current market bid\n"
-                "  3 = Current market mid\n"
-                "  4 = Current market ask",
+                _PRICE_TYPE_ERR,
                 field="price_type",
                 value=price_type
             )
@@ -435,7 +535,7 @@ class InputValidator:
 
         if price_low >= price_high:
             raise ValidationError(
-                f"Low price ({price_low}) must be less than high price ({price_high})",
+                ("Low price ({}) must be less than high price ({})", (price_low, price_high)),
                 field="price_range",
                 value=(price_low, price_high)
             )
@@ -469,14 +569,7 @@ class InputValidator:
         Raises:
             ValidationError: If num_orders would result in invalid order sizes.
         """
-        try:
-            num_orders = int(num_orders)
-        except (TypeError, ValueError):
-            raise ValidationError(
-                f"Number of orders must be a valid integer, got: {type(num_orders).__name__}",
-                field="num_orders",
-                value=num_orders
-            )
+        num_orders = _to_int(num_orders, "num_orders", "Number of orders")
 
         if num_orders < 1:
             raise ValidationError(
@@ -487,7 +580,7 @@ class InputValidator:
 
         if num_orders > max_orders:
             raise ValidationError(
-                f"Number of orders cannot exceed {max_orders}",
+                ("Number of orders cannot exceed {}", (max_orders,)),
                 field="num_orders",
                 value=num_orders
             )
@@ -495,12 +588,12 @@ class InputValidator:
         # For linear distribution, each order gets total_size/num_orders
         # For other distributions, minimum per-order could be even smaller
         # Validate conservatively using linear (worst case for min size)
-        min_per_order = total_size / num_orders
-        if min_per_order < min_size:
-            max_valid = int(total_size / min_size)
+        if total_size < min_size * num_orders * (1 - _SIZE_RTOL):
+            min_per_order = total_size / num_orders
+            max_valid = int(total_size / min_size * (1 + _SIZE_RTOL))
             raise ValidationError(
-                f"Order size ({min_per_order:.8f}) would be below minimum ({min_size}). "
-                f"Reduce number of orders to at most {max_valid}",
+                ("Order size ({:.8f}) would be below minimum ({}). "
+                 "Reduce number of orders to at most {}", (min_per_order, min_size, max_valid)),
                 field="num_orders",
                 value=num_orders
             )
@@ -6,14 +6,17 @@ and benchmark comparison for VWAP orders.
 """
 
 import logging
+import sys
 import time
 from typing import Optional, Callable
 from datetime import datetime
-from tabulate import tabulate
+
+import numpy as np
 
 from vwap_strategy import VWAPStrategy, VWAPStrategyConfig
 from order_executor import CancelledException
 from input_helpers import InteractiveInputHelper
+from validators import InputValidator, ValidationError
 from ui_helpers import (
     info, highlight, format_currency, format_side, format_status,
     print_header, print_subheader, print_success, print_error,
@@ -21,6 +24,36 @@ from ui_helpers import (
 )
 
 
+# Volume bars indexed by length, for the profile preview.
+_BARS = tuple('#' * i for i in range(21))
+
+# Errors that mean "ask again" in interactive prompts.
+_INPUT_EXC = (ValueError, ValidationError)
+
+_PRICE_TYPES = {'1': 'limit', '2': 'bid', '3': 'mid', '4': 'ask'}
+
+
+def _prompt(get_input_fn: Callable, msg: str, parser: Callable, validate: Optional[Callable] = None):
+    """Prompt until the input parses (and validates), returning the resulting value."""
+    while True:
+        try:
+            value = parser(get_input_fn(msg))
+            return validate(value) if validate is not None else value
+        except _INPUT_EXC as e:
+            print(f"Invalid input: {e}")
+
+
+def _parse_lookback(raw: str) -> int:
+    """Parse volume lookback hours, defaulting to 24 on empty input."""
+    try:
+        hours = int(raw or "24")
+    except ValueError:
+        raise ValidationError("Please enter a valid number.")
+    if hours < 1 or hours > 168:
+        raise ValidationError("Lookback must be 1-168 hours")
+    return hours
+
+
 class VWAPExecutor:
     """
     Executes VWAP orders using volume-weighted slice sizing.
@@ -87,24 +120,11 @@ class VWAPExecutor:
             print("3. Current market mid")
             print("4. Current market ask")
 
-            price_type_map = {'1': 'limit', '2': 'bid', '3': 'mid', '4': 'ask'}
-            while True:
-                choice = get_input_fn("Enter your choice (1-4)")
-                if choice in price_type_map:
-                    price_type = price_type_map[choice]
-                    break
-                print("Invalid choice.")
+            price_type = _prompt(get_input_fn, "Enter your choice (1-4)",
+                                 InputValidator.validate_price_type, _PRICE_TYPES.__getitem__)
 
             # Get lookback hours
-            while True:
-                try:
-                    lookback = int(get_input_fn("\nVolume lookback hours (default 24)") or "24")
-                    if lookback < 1 or lookback > 168:
-                        print("Lookback must be 1-168 hours.")
-                        continue
-                    break
-                except ValueError:
-                    print("Please enter a valid number.")
+            lookback = _prompt(get_input_fn, "\nVolume lookback hours (default 24)", _parse_lookback)
 
             # Create strategy config
             vwap_config = VWAPStrategyConfig(
@@ -132,15 +152,26 @@ class VWAPExecutor:
             slices = strategy.calculate_slices()
 
             # Round sizes
-            for s in slices:
-                s.size = self.market_data.round_size(s.size, product_id)
+            sizes = np.fromiter((s.size for s in slices), dtype=np.float64, count=len(slices))
+            sizes = self.market_data.round_size_batch(sizes, product_id)
+            for s, size in zip(slices, sizes.tolist()):
+                s.size = size
+
+            # Check every slice against the product's size limits at once
+            min_size, max_size = self._get_size_limits(product_id)
+            try:
+                InputValidator.validate_sizes(sizes, min_size, max_size)
+            except ValidationError as e:
+                print_error(f"Invalid slice sizes: {e}. Adjust the total size or number of slices.")
+                return None
 
             # Display volume profile
             self._display_volume_profile(strategy, slices, product_id, side, total_size)
 
             # Display benchmark
-            if strategy.benchmark_vwap > 0:
-                print(f"\nBenchmark VWAP ({lookback}h): {format_currency(strategy.benchmark_vwap, colored=False)}")
+            benchmark = strategy.benchmark_vwap
+            if benchmark > 0:
+                print(f"\nBenchmark VWAP ({lookback}h): {format_currency(benchmark, colored=False)}")
 
             # Confirm
             confirm = get_input_fn("\nPlace this VWAP order? (yes/no)").lower()
@@ -171,6 +202,18 @@ class VWAPExecutor:
             print_error(f"Error placing VWAP order: {str(e)}")
             return None
 
+    def _get_size_limits(self, product_id):
+        """Return the product's (min, max) base order size, with permissive defaults."""
+        try:
+            product_info = self.api_client.get_product(product_id)
+            if isinstance(product_info, dict):
+                return (float(product_info.get('base_min_size', '0.0001')),
+                        float(product_info.get('base_max_size', '1000000')))
+            return (float(getattr(product_info, 'base_min_size', '0.0001')),
+                    float(getattr(product_info, 'base_max_size', '1000000')))
+        except Exception:
+            return 0.0001, 1000000.0
+
     def _display_volume_profile(self, strategy, slices, product_id, side, total_size):
         """Display the volume profile and slice sizing."""
         print_header(f"\nVWAP Order Preview - {product_id}")
@@ -182,24 +225,31 @@ class VWAPExecutor:
             print_warning("No volume profile data available.")
             return
 
-        headers = ['#', 'Volume Weight', 'Size', '% of Total', 'Bar']
-        rows = []
-        max_weight = max(profile) if profile else 1.0
+        headers = ('#', 'Volume Weight', 'Size', '% of Total', 'Bar')
+        widths = (max(len(headers[0]), len(str(strategy.num_slices))), 13, 16, 10)
+        fmt = "{:>%d}  {:>%d}  {:>%d}  {:>%d}  {}\n" % widths
+        out = [fmt.format(*headers), fmt.format(*('-' * w for w in widths), '-' * 20)]
+        weights = np.zeros(len(slices))
+        n = min(len(profile), len(slices))
+        weights[:n] = profile[:n]
+        max_weight = weights.max() if n else 0.0
+        if max_weight > 0:
+            bar_lens = np.clip(weights * (20.0 / max_weight), 0, 20).astype(np.intp)
+        else:
+            bar_lens = np.zeros(len(slices), dtype=np.intp)
+        sizes = np.fromiter((s.size for s in slices), dtype=np.float64, count=len(slices))
+        pcts = sizes * (100.0 / total_size) if total_size > 0 else np.zeros(len(slices))
 
-        for i, s in enumerate(slices):
-            weight = profile[i] if i < len(profile) else 0
-            pct = (s.size / total_size * 100) if total_size > 0 else 0
-            bar_len = int((weight / max_weight) * 20) if max_weight > 0 else 0
-            bar = '#' * bar_len
-            rows.append([
+        for s, weight, pct, bar_len in zip(slices, weights.tolist(), pcts.tolist(), bar_lens.tolist()):
+            out.append(fmt.format(
                 s.slice_number,
                 f"{weight:.4f}",
                 f"{s.size:.8f}",
                 f"{pct:.1f}%",
-                bar
-            ])
+                _BARS[bar_len]
+            ))
 
-        print(tabulate(rows, headers=headers, tablefmt='simple'))
+        sys.stdout.write(''.join(out))
 
     def display_vwap_summary(self, strategy_or_id) -> None:
         """
@@ -6,18 +6,24 @@ proportionally to expected trading volume at each time period.
 """
 
 import logging
+import operator
+import threading
 import time
 import uuid
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple, NamedTuple
+from datetime import datetime
 from dataclasses import dataclass
 
-from order_strategy import OrderStrategy, SliceSpec, StrategyResult, StrategyStatus
+import numpy as np
 
+from order_strategy import _SLOTS, OrderStrategy, SliceSpec, StrategyResult, StrategyStatus
 
-@dataclass
+_log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, **_SLOTS)
 class VWAPStrategyConfig:
-    """Configuration for VWAP strategy."""
+    """Configuration for VWAP strategy. Immutable, so it can be shared and hashed."""
     duration_minutes: int = 60
     num_slices: int = 10
     price_type: str = "mid"
@@ -26,6 +32,74 @@ class VWAPStrategyConfig:
     benchmark_enabled: bool = True
 
 
+_CANDLE_FIELDS = ('high', 'low', 'close', 'volume', 'start')
+
+
+class CandleArrays(NamedTuple):
+    """Candle fields as parallel arrays, one element per candle."""
+    highs: np.ndarray
+    lows: np.ndarray
+    closes: np.ndarray
+    volumes: np.ndarray
+    starts: np.ndarray
+
+
+def _parse_candles(candles) -> CandleArrays:
+    """
+    Parse candles into contiguous per-field arrays in a single pass.
+
+    Candles may be dicts or objects with attributes; the access style is
+    taken from the first candle. Missing fields read as 0. Prices and volumes
+    are float64, starts are int64 epoch seconds.
+    """
+    candles = list(candles)
+    is_dict = bool(candles) and isinstance(candles[0], dict)
+    getter = operator.itemgetter(*_CANDLE_FIELDS) if is_dict else operator.attrgetter(*_CANDLE_FIELDS)
+    try:
+        rows = list(map(getter, candles))
+    except (KeyError, AttributeError):
+        # Some candle lacks a field; take the slower path that defaults it to 0
+        if is_dict:
+            rows = [tuple(c.get(f, 0) for f in _CANDLE_FIELDS) for c in candles]
+        else:
+            rows = [tuple(getattr(c, f, 0) for f in _CANDLE_FIELDS) for c in candles]
+    # Transpose to one contiguous row per field
+    columns = np.array(rows, dtype=np.float64).reshape(-1, len(_CANDLE_FIELDS)).T.copy()
+    highs, lows, closes, volumes, starts = columns
+    return CandleArrays(highs, lows, closes, volumes, starts.astype(np.int64))
+
+
+# Hour-of-day volumes and benchmark VWAPs shared across strategy instances, keyed
+# by (product_id, granularity, lookback_seconds) of the candle window they were
+# computed from and holding (monotonic_ts, value).
+_VOLUME_CACHE_TTL = 300.0
+_volume_cache_lock = threading.Lock()
+_volume_cache: Dict[Tuple[str, str, int], Tuple[float, np.ndarray]] = {}
+_benchmark_cache: Dict[Tuple[str, str, int], Tuple[float, float]] = {}
+
+
+def _cache_get(cache: dict, key: Tuple[str, str, int]):
+    """Return the cached value for key, or None if missing or older than the TTL."""
+    with _volume_cache_lock:
+        entry = cache.get(key)
+    if entry is None or time.monotonic() - entry[0] >= _VOLUME_CACHE_TTL:
+        return None
+    return entry[1]
+
+
+def _cache_put(cache: dict, key: Tuple[str, str, int], value) -> None:
+    """Store value for key, stamped with the current monotonic time."""
+    with _volume_cache_lock:
+        cache[key] = (time.monotonic(), value)
+
+
+def clear_volume_cache() -> None:
+    """Drop all cached hour-of-day volumes and benchmark VWAPs."""
+    with _volume_cache_lock:
+        _volume_cache.clear()
+        _benchmark_cache.clear()
+
+
 class VWAPStrategy(OrderStrategy):
     """
     Strategy that distributes order sizes proportionally to historical
@@ -53,6 +127,9 @@ class VWAPStrategy(OrderStrategy):
         self.num_slices = num_slices
         self.duration_minutes = duration_minutes
         self.api_client = api_client
+        # +1 when paying above the benchmark is unfavorable (BUY), -1 for SELL
+        self._slippage_sign = 1.0 if side == 'BUY' else -1.0
+        self._total_size_f = float(total_size)
         self.vwap_config = config or VWAPStrategyConfig(
             duration_minutes=duration_minutes,
             num_slices=num_slices,
@@ -64,73 +141,116 @@ class VWAPStrategy(OrderStrategy):
         self._status = StrategyStatus.PENDING
         self._volume_profile: List[float] = []
         self._benchmark_vwap: float = 0.0
+        # Bumped on every slice completion; _aggregate_fills caches per version
+        self._fills_version = 0
+        self._fills_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        # ((start, end, granularity), candles) of the last candle fetch
+        self._candles_cache: Optional[Tuple[Tuple[str, str, str], list]] = None
+        # Parsed form of the cached candles, built on first use
+        self._candle_arrays: Optional[CandleArrays] = None
+
+    def _candle_window(self) -> Tuple[str, str, str]:
+        """Return the (start, end, granularity) of the configured lookback, ending now."""
+        end = int(time.time())
+        start = end - (self.vwap_config.volume_lookback_hours * 3600)
+        return str(start), str(end), self.vwap_config.granularity
+
+    def _get_candles_cached(self, start: str, end: str, granularity: str):
+        """Fetch candles for a window, reusing the last response if the window is unchanged."""
+        key = (start, end, granularity)
+        if self._candles_cache is not None and self._candles_cache[0] == key:
+            return self._candles_cache[1]
+
+        candles = self.api_client.get_candles(
+            product_id=self.product_id,
+            start=start,
+            end=end,
+            granularity=granularity
+        )
+        self._candles_cache = (key, candles)
+        self._candle_arrays = None
+        return candles
+
+    def _get_candle_arrays(self, window: Optional[Tuple[str, str, str]] = None) -> Optional[CandleArrays]:
+        """Return the parsed candles for a window (parsing each batch once), or None if empty."""
+        candles = self._get_candles_cached(*(window or self._candle_window()))
+        if not candles:
+            return None
+        if self._candle_arrays is None:
+            self._candle_arrays = _parse_candles(candles)
+        return self._candle_arrays
+
+    def _cache_key(self, window: Tuple[str, str, str]) -> Tuple[str, str, int]:
+        """Key for the shared volume and benchmark caches: product, granularity and window length."""
+        start, end, granularity = window
+        return (self.product_id, granularity, int(end) - int(start))
+
+    def _hourly_volumes(self, window: Optional[Tuple[str, str, str]] = None) -> Optional[np.ndarray]:
+        """
+        Return average volume per hour-of-day (UTC) as a read-only 24-element array.
 
-    def _fetch_volume_profile(self) -> List[float]:
+        Hours with no candles are NaN. Results are shared across instances for
+        _VOLUME_CACHE_TTL seconds; None means no candle data was available.
+        """
+        window = window or self._candle_window()
+        key = self._cache_key(window)
+        avg_volumes = _cache_get(_volume_cache, key)
+        if avg_volumes is not None:
+            return avg_volumes
+
+        arrays = self._get_candle_arrays(window)
+        if arrays is None:
+            return None
+
+        # Sum and count volume per hour-of-day (UTC) in 24 bins
+        hours = (arrays.starts % 86400) // 3600
+        sum_vol = np.bincount(hours, weights=arrays.volumes, minlength=24)
+        count = np.bincount(hours, minlength=24)
+
+        avg_volumes = np.divide(sum_vol, count, out=np.full(24, np.nan), where=count > 0)
+        avg_volumes.flags.writeable = False
+        _cache_put(_volume_cache, key, avg_volumes)
+        return avg_volumes
+
+    def _fetch_volume_profile(self, window: Optional[Tuple[str, str, str]] = None) -> List[float]:
         """
         Fetch historical candle data and build normalized volume profile by hour-of-day.
 
+        Args:
+            window: (start, end, granularity) to fetch; defaults to the lookback ending now.
+
         Returns:
             List of normalized volume weights (sum to 1.0), one per slice.
         """
         try:
-            lookback_hours = self.vwap_config.volume_lookback_hours
-            granularity = self.vwap_config.granularity
-
-            end = int(time.time())
-            start = end - (lookback_hours * 3600)
-
-            candles = self.api_client.get_candles(
-                product_id=self.product_id,
-                start=str(start),
-                end=str(end),
-                granularity=granularity
-            )
+            hourly = self._hourly_volumes(window)
 
-            if not candles:
-                logging.warning("No candle data available, falling back to flat profile")
+            if hourly is None:
+                _log.warning("No candle data available, falling back to flat profile")
                 return self._flat_profile()
 
-            # Extract volumes, handling both dict and object access
-            volumes_by_hour = {}
-            for candle in candles:
-                if isinstance(candle, dict):
-                    hour = int(candle.get('start', 0)) % 86400 // 3600
-                    volume = float(candle.get('volume', 0))
-                else:
-                    hour = int(getattr(candle, 'start', 0)) % 86400 // 3600
-                    volume = float(getattr(candle, 'volume', 0))
-
-                if hour not in volumes_by_hour:
-                    volumes_by_hour[hour] = []
-                volumes_by_hour[hour].append(volume)
-
-            # Average volume per hour-of-day
-            avg_volumes = {}
-            for hour, vols in volumes_by_hour.items():
-                avg_volumes[hour] = sum(vols) / len(vols) if vols else 0
-
-            if not avg_volumes or sum(avg_volumes.values()) == 0:
+            # Average volume per hour-of-day, over the hours that had candles
+            seen = ~np.isnan(hourly)
+            avg_volumes = np.where(seen, hourly, 0.0)
+            if not seen.any() or avg_volumes[seen].sum() == 0:
                 return self._flat_profile()
 
-            # Map slices to hours and get their volume weights
+            # Map slices to (local) hours and get their volume weights
             now = datetime.now()
             duration_seconds = self.duration_minutes * 60
             slice_interval = duration_seconds / self.num_slices
+            seconds_into_day = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+            slice_seconds = seconds_into_day + np.arange(self.num_slices) * slice_interval
+            slice_hours = (slice_seconds // 3600).astype(np.int64) % 24
 
-            weights = []
-            for i in range(self.num_slices):
-                slice_time = now + timedelta(seconds=i * slice_interval)
-                hour = slice_time.hour
-                weight = avg_volumes.get(hour, 0)
-                if weight == 0:
-                    # Use average of all hours as fallback
-                    weight = sum(avg_volumes.values()) / len(avg_volumes)
-                weights.append(weight)
-
-            # Normalize to sum to 1.0
-            total_weight = sum(weights)
+            weights = avg_volumes[slice_hours]
+            # Use the average of all seen hours where a slice's hour has no volume
+            weights[weights == 0] = avg_volumes[seen].mean()
+
+            # Normalize to sum to 1.0, converting to the public list form once
+            total_weight = weights.sum()
             if total_weight > 0:
-                weights = [w / total_weight for w in weights]
+                weights = (weights / total_weight).tolist()
             else:
                 weights = self._flat_profile()
 
@@ -138,7 +258,7 @@ class VWAPStrategy(OrderStrategy):
             return weights
 
         except Exception as e:
-            logging.error(f"Error fetching volume profile: {str(e)}")
+            _log.error("Error fetching volume profile: %s", e)
             return self._flat_profile()
 
     def _flat_profile(self) -> List[float]:
@@ -147,76 +267,68 @@ class VWAPStrategy(OrderStrategy):
 
     def calculate_slices(self) -> List[SliceSpec]:
         """Calculate slices with sizes proportional to volume profile."""
-        weights = self._fetch_volume_profile()
+        # One candle window (and so one API call) for the profile and the benchmark
+        window = self._candle_window()
+        weights = self._fetch_volume_profile(window)
 
         now = time.time()
         duration_seconds = self.duration_minutes * 60
         slice_interval = duration_seconds / self.num_slices
 
-        self._slices = []
-        for i in range(self.num_slices):
-            size = self.total_size * weights[i]
-            self._slices.append(SliceSpec(
+        sizes = (self._total_size_f * np.asarray(weights[:self.num_slices], dtype=np.float64)).tolist()
+        times = (np.arange(self.num_slices, dtype=np.float64) * slice_interval + now).tolist()
+        price_type = self.vwap_config.price_type
+        self._slices = [
+            SliceSpec(
                 slice_number=i + 1,
                 size=size,
                 price=self.limit_price,
-                scheduled_time=now + i * slice_interval,
-                price_type=self.vwap_config.price_type
-            ))
+                scheduled_time=scheduled_time,
+                price_type=price_type
+            )
+            for i, (size, scheduled_time) in enumerate(zip(sizes, times))
+        ]
 
-        # Calculate benchmark VWAP if enabled
+        # Calculate benchmark VWAP if enabled; the order preview shows it
         if self.vwap_config.benchmark_enabled:
-            self._benchmark_vwap = self._calculate_benchmark_vwap()
+            self._benchmark_vwap = self._calculate_benchmark_vwap(window)
 
         self._status = StrategyStatus.ACTIVE
         return self._slices
 
-    def _calculate_benchmark_vwap(self) -> float:
+    def _calculate_benchmark_vwap(self, window: Optional[Tuple[str, str, str]] = None) -> float:
         """
         Calculate benchmark VWAP from candle data: sum(price * volume) / sum(volume).
 
         Uses the typical price (high + low + close) / 3 for each candle.
+
+        Args:
+            window: (start, end, granularity) to fetch; defaults to the lookback ending now.
         """
         try:
-            lookback_hours = self.vwap_config.volume_lookback_hours
-            granularity = self.vwap_config.granularity
+            window = window or self._candle_window()
+            key = self._cache_key(window)
+            cached = _cache_get(_benchmark_cache, key)
+            if cached is not None:
+                return cached
 
-            end = int(time.time())
-            start = end - (lookback_hours * 3600)
-
-            candles = self.api_client.get_candles(
-                product_id=self.product_id,
-                start=str(start),
-                end=str(end),
-                granularity=granularity
-            )
+            arrays = self._get_candle_arrays(window)
 
-            if not candles:
+            if arrays is None:
                 return 0.0
 
-            sum_pv = 0.0
-            sum_v = 0.0
-
-            for candle in candles:
-                if isinstance(candle, dict):
-                    high = float(candle.get('high', 0))
-                    low = float(candle.get('low', 0))
-                    close = float(candle.get('close', 0))
-                    volume = float(candle.get('volume', 0))
-                else:
-                    high = float(getattr(candle, 'high', 0))
-                    low = float(getattr(candle, 'low', 0))
-                    close = float(getattr(candle, 'close', 0))
-                    volume = float(getattr(candle, 'volume', 0))
-
-                typical_price = (high + low + close) / 3
-                sum_pv += typical_price * volume
-                sum_v += volume
+            volumes = arrays.volumes
+            sum_v = volumes.sum()
+            if sum_v <= 0:
+                return 0.0
 
-            return sum_pv / sum_v if sum_v > 0 else 0.0
+            typical_prices = (arrays.highs + arrays.lows + arrays.closes) * (1.0 / 3.0)
+            benchmark = float(np.vdot(typical_prices, volumes) / sum_v)
+            _cache_put(_benchmark_cache, key, benchmark)
+            return benchmark
 
         except Exception as e:
-            logging.error(f"Error calculating benchmark VWAP: {str(e)}")
+            _log.error("Error calculating benchmark VWAP: %s", e)
             return 0.0
 
     def on_slice_complete(
@@ -230,6 +342,7 @@ class VWAPStrategy(OrderStrategy):
             'order_id': order_id,
             'fill_info': fill_info
         }
+        self._fills_version += 1
 
         if len(self._completed_slices) >= self.num_slices:
             self._status = StrategyStatus.COMPLETED
@@ -259,20 +372,57 @@ class VWAPStrategy(OrderStrategy):
         else:  # 'limit' or default
             return self.limit_price
 
-    def get_execution_vwap(self) -> float:
-        """Calculate the execution VWAP from actual fills."""
+    def _aggregate_fills(self) -> Dict[str, Any]:
+        """
+        Aggregate completed slices in a single pass, cached until the next completion.
+
+        Returns:
+            Dict with total_filled, total_value, total_fees, num_filled and
+            num_failed (as reported by get_result) and execution_vwap.
+            The dict is shared between calls and must not be modified.
+        """
+        if self._fills_cache is not None and self._fills_cache[0] == self._fills_version:
+            return self._fills_cache[1]
+
+        total_filled = 0.0
         total_value = 0.0
-        total_size = 0.0
+        total_fees = 0.0
+        num_filled = 0
+        num_failed = 0
+        vwap_value = 0.0
+        vwap_size = 0.0
 
         for data in self._completed_slices.values():
             fill = data.get('fill_info') or {}
             size = fill.get('filled_size', 0)
             price = fill.get('price', 0)
             if size > 0 and price > 0:
-                total_value += size * price
-                total_size += size
+                vwap_value += size * price
+                vwap_size += size
+
+            if data.get('order_id'):
+                if size > 0:
+                    total_filled += size
+                    total_value += fill.get('filled_value', size * price)
+                    total_fees += fill.get('fees', 0)
+                    num_filled += 1
+            else:
+                num_failed += 1
+
+        agg = {
+            'total_filled': total_filled,
+            'total_value': total_value,
+            'total_fees': total_fees,
+            'num_filled': num_filled,
+            'num_failed': num_failed,
+            'execution_vwap': vwap_value / vwap_size if vwap_size > 0 else 0.0,
+        }
+        self._fills_cache = (self._fills_version, agg)
+        return agg
 
-        return total_value / total_size if total_size > 0 else 0.0
+    def get_execution_vwap(self) -> float:
+        """Calculate the execution VWAP from actual fills."""
+        return self._aggregate_fills()['execution_vwap']
 
     def get_performance_vs_benchmark(self) -> Dict[str, float]:
         """
@@ -283,8 +433,11 @@ class VWAPStrategy(OrderStrategy):
             Positive slippage = unfavorable for the side (paid more for BUY, got less for SELL).
             Negative slippage = favorable.
         """
-        exec_vwap = self.get_execution_vwap()
-        benchmark = self._benchmark_vwap
+        return self._performance(self.get_execution_vwap())
+
+    def _performance(self, exec_vwap: float) -> Dict[str, float]:
+        """Build the benchmark comparison for an already computed execution VWAP."""
+        benchmark = self.benchmark_vwap
 
         if benchmark == 0 or exec_vwap == 0:
             return {
@@ -293,13 +446,9 @@ class VWAPStrategy(OrderStrategy):
                 'slippage_bps': 0.0
             }
 
-        # Slippage in basis points
-        if self.side == 'BUY':
-            # For BUY: positive slippage means we paid more than benchmark
-            slippage_bps = (exec_vwap - benchmark) / benchmark * 10000
-        else:
-            # For SELL: positive slippage means we got less than benchmark
-            slippage_bps = (benchmark - exec_vwap) / benchmark * 10000
+        # Slippage in basis points: for BUY, paying more than benchmark is positive;
+        # for SELL, receiving less than benchmark is positive
+        slippage_bps = self._slippage_sign * (exec_vwap - benchmark) / benchmark * 10000.0
 
         return {
             'execution_vwap': exec_vwap,
@@ -319,27 +468,12 @@ class VWAPStrategy(OrderStrategy):
 
     def get_result(self) -> StrategyResult:
         """Get current strategy execution result with VWAP metadata."""
-        total_filled = 0.0
-        total_value = 0.0
-        total_fees = 0.0
-        num_filled = 0
-        num_failed = 0
-
-        for data in self._completed_slices.values():
-            fill = data.get('fill_info') or {}
-            if data.get('order_id'):
-                filled_size = fill.get('filled_size', 0)
-                if filled_size > 0:
-                    total_filled += filled_size
-                    total_value += fill.get('filled_value', filled_size * fill.get('price', 0))
-                    total_fees += fill.get('fees', 0)
-                    num_filled += 1
-            else:
-                num_failed += 1
-
+        agg = self._aggregate_fills()
+        total_filled = agg['total_filled']
+        total_value = agg['total_value']
         avg_price = total_value / total_filled if total_filled > 0 else 0.0
-        exec_vwap = self.get_execution_vwap()
-        perf = self.get_performance_vs_benchmark()
+        exec_vwap = agg['execution_vwap']
+        perf = self._performance(exec_vwap)
 
         return StrategyResult(
             strategy_id=self.strategy_id,
@@ -347,14 +481,14 @@ class VWAPStrategy(OrderStrategy):
             total_size=self.total_size,
             total_filled=total_filled,
             total_value=total_value,
-            total_fees=total_fees,
+            total_fees=agg['total_fees'],
             average_price=avg_price,
             vwap=exec_vwap,
             num_slices=self.num_slices,
-            num_filled=num_filled,
-            num_failed=num_failed,
+            num_filled=agg['num_filled'],
+            num_failed=agg['num_failed'],
             metadata={
-                'benchmark_vwap': self._benchmark_vwap,
+                'benchmark_vwap': perf['benchmark_vwap'],
                 'slippage_bps': perf.get('slippage_bps', 0.0),
                 'volume_profile': self._volume_profile,
             }
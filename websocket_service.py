@@ -16,13 +16,31 @@ Usage:
 """
 
 import json
+import queue
 import time
 import logging
 import threading
-from typing import Optional, Dict, List, Callable, Any
+from typing import Optional, Dict, List, Callable, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib parser
+    orjson = None
 
 from config_manager import WebSocketConfig
 
+_log = logging.getLogger(__name__)
+
+# orjson parses str and bytes alike; its JSONDecodeError subclasses json's.
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Number of independently locked price cache shards (a power of two).
+_PRICE_SHARDS = 16
+
+# Fill events waiting for the dispatch thread; beyond this they are dropped.
+_FILL_QUEUE_SIZE = 1024
+_STOP_DISPATCH = object()
+
 
 class WebSocketService:
     """Thread-safe WebSocket service for real-time prices and fill events."""
@@ -42,14 +60,26 @@ class WebSocketService:
         self._api_key = api_key
         self._api_secret = api_secret
 
-        # Price cache: product_id -> {bid, ask, mid, timestamp}
-        self._price_cache: Dict[str, Dict[str, Any]] = {}
-        self._price_lock = threading.Lock()
+        # Price cache: product_id -> (bid, ask, mid, monotonic timestamp), split into
+        # shards by product so ticker writes and readers rarely share a lock
+        self._price_shards: List[Dict[str, Tuple[float, float, float, float]]] = [
+            {} for _ in range(_PRICE_SHARDS)
+        ]
+        self._price_locks = [threading.Lock() for _ in range(_PRICE_SHARDS)]
 
-        # Fill callbacks
-        self._fill_callbacks: List[Callable[[dict], None]] = []
+        # Fill callbacks, replaced (never mutated) under _fill_lock so the
+        # dispatch path can iterate the current tuple without locking
+        self._fill_callbacks: Tuple[Callable[[dict], None], ...] = ()
         self._fill_lock = threading.Lock()
 
+        # Fill events are handed to a dispatch thread once start() runs, so
+        # slow callbacks don't hold up the WebSocket reader. Each dispatcher
+        # gets a fresh queue and stop event, so a worker that outlived stop()
+        # cannot consume events meant for a later one.
+        self._fill_queue: queue.Queue = queue.Queue(maxsize=_FILL_QUEUE_SIZE)
+        self._fill_stop = threading.Event()
+        self._fill_worker: Optional[threading.Thread] = None
+
         # WebSocket clients
         self._ticker_client = None
         self._user_client = None
@@ -58,7 +88,7 @@ class WebSocketService:
         self._connected = False
         self._subscribed_products: List[str] = []
 
-        logging.info("WebSocketService initialized")
+        _log.info("WebSocketService initialized")
 
     @property
     def is_connected(self) -> bool:
@@ -71,7 +101,7 @@ class WebSocketService:
             product_ids: Products to subscribe to for ticker data.
         """
         if not self._config.enabled:
-            logging.info("WebSocket disabled by config")
+            _log.info("WebSocket disabled by config")
             return
 
         try:
@@ -79,13 +109,14 @@ class WebSocketService:
                 self._start_ticker(product_ids)
 
             if self._config.user_channel_enabled:
+                self._start_fill_dispatcher()
                 self._start_user()
 
             self._connected = True
-            logging.info("WebSocket connections started")
+            _log.info("WebSocket connections started")
 
         except Exception as e:
-            logging.error(f"Error starting WebSocket: {e}")
+            _log.error("Error starting WebSocket: %s", e)
             self._connected = False
 
     def _start_ticker(self, product_ids: List[str]):
@@ -107,10 +138,10 @@ class WebSocketService:
             self._ticker_client.open()
             self._ticker_client.ticker(product_ids=product_ids)
             self._subscribed_products = list(product_ids)
-            logging.info(f"Ticker subscribed to {len(product_ids)} products")
+            _log.info("Ticker subscribed to %d products", len(product_ids))
 
         except Exception as e:
-            logging.error(f"Error starting ticker WebSocket: {e}")
+            _log.error("Error starting ticker WebSocket: %s", e)
 
     def _start_user(self):
         """Start the user channel WebSocket client for fill events."""
@@ -130,10 +161,59 @@ class WebSocketService:
 
             self._user_client.open()
             self._user_client.user(product_ids=[])
-            logging.info("User channel subscribed")
+            _log.info("User channel subscribed")
 
         except Exception as e:
-            logging.error(f"Error starting user WebSocket: {e}")
+            _log.error("Error starting user WebSocket: %s", e)
+
+    def _start_fill_dispatcher(self):
+        """Start the thread that runs fill callbacks off the WebSocket thread."""
+        if self._fill_worker is not None and self._fill_worker.is_alive():
+            return
+        self._fill_queue = queue.Queue(maxsize=_FILL_QUEUE_SIZE)
+        self._fill_stop = threading.Event()
+        self._fill_worker = threading.Thread(
+            target=self._fill_dispatch_loop, args=(self._fill_queue, self._fill_stop),
+            name="ws-fill-dispatch", daemon=True
+        )
+        self._fill_worker.start()
+
+    def _stop_fill_dispatcher(self):
+        """Stop the fill dispatch thread after it has delivered queued events."""
+        worker = self._fill_worker
+        if worker is None:
+            return
+        self._fill_worker = None
+        self._fill_stop.set()
+        try:
+            # Wakes an idle worker; a full queue means it is busy and will see the event
+            self._fill_queue.put_nowait(_STOP_DISPATCH)
+        except queue.Full:
+            pass
+        worker.join(timeout=5)
+        if worker.is_alive():
+            _log.warning("Fill dispatch thread did not stop within 5s")
+
+    def _fill_dispatch_loop(self, fill_queue: queue.Queue, stop: threading.Event):
+        """Deliver queued fill events to the registered callbacks until stopped and drained."""
+        while True:
+            fill_event = fill_queue.get()
+            try:
+                if fill_event is _STOP_DISPATCH:
+                    return
+                self._dispatch_fill(fill_event)
+            finally:
+                fill_queue.task_done()
+            if stop.is_set() and fill_queue.empty():
+                return
+
+    def _dispatch_fill(self, fill_event: dict):
+        """Run every registered fill callback, isolating their errors."""
+        for callback in self._fill_callbacks:
+            try:
+                callback(fill_event)
+            except Exception as e:
+                _log.error("Fill callback error: %s", e)
 
     def subscribe_ticker(self, product_ids: List[str]):
         """Subscribe to ticker for additional products.
@@ -142,7 +222,7 @@ class WebSocketService:
             product_ids: Products to add to ticker subscription.
         """
         if not self._ticker_client:
-            logging.warning("Ticker client not started")
+            _log.warning("Ticker client not started")
             return
 
         new_products = [p for p in product_ids if p not in self._subscribed_products]
@@ -152,9 +232,9 @@ class WebSocketService:
         try:
             self._ticker_client.ticker(product_ids=new_products)
             self._subscribed_products.extend(new_products)
-            logging.info(f"Added ticker subscriptions: {new_products}")
+            _log.info("Added ticker subscriptions: %s", new_products)
         except Exception as e:
-            logging.error(f"Error subscribing to ticker: {e}")
+            _log.error("Error subscribing to ticker: %s", e)
 
     def register_fill_callback(self, callback: Callable[[dict], None]):
         """Register a callback for fill events.
@@ -162,11 +242,14 @@ class WebSocketService:
         The callback receives a dict with:
             order_id, product_id, side, size, price, fee, trade_time
 
+        Once start() has run, callbacks are called on a dedicated dispatch
+        thread, in the order fills arrive.
+
         Args:
             callback: Function called on each fill event.
         """
         with self._fill_lock:
-            self._fill_callbacks.append(callback)
+            self._fill_callbacks = self._fill_callbacks + (callback,)
 
     def get_current_prices(self, product_id: str) -> Optional[Dict[str, float]]:
         """Get cached prices for a product.
@@ -179,26 +262,63 @@ class WebSocketService:
         Returns:
             Dict with 'bid', 'ask', 'mid' or None if stale/missing.
         """
-        with self._price_lock:
-            cached = self._price_cache.get(product_id)
-            if not cached:
-                return None
+        return self._fresh_prices(product_id, time.monotonic())
 
-            age = time.time() - cached.get('timestamp', 0)
-            if age > self._config.price_stale_seconds:
-                return None
+    def get_current_prices_many(self, product_ids: List[str]) -> Dict[str, Dict[str, float]]:
+        """Get cached prices for several products, reading the clock once.
 
-            return {
-                'bid': cached['bid'],
-                'ask': cached['ask'],
-                'mid': cached['mid'],
-            }
+        Args:
+            product_ids: The product IDs to look up.
+
+        Returns:
+            Dict of product_id -> {'bid', 'ask', 'mid'} for products with
+            fresh cached prices; stale or missing products are omitted.
+        """
+        now = time.monotonic()
+        prices = {}
+        for product_id in product_ids:
+            fresh = self._fresh_prices(product_id, now)
+            if fresh is not None:
+                prices[product_id] = fresh
+        return prices
+
+    def _fresh_prices(self, product_id: str, now: float) -> Optional[Dict[str, float]]:
+        """Return a product's cached prices if they are no older than the stale limit at `now`."""
+        shard = self._price_shard(product_id)
+        with self._price_locks[shard]:
+            cached = self._price_shards[shard].get(product_id)
+        if cached is None:
+            return None
+
+        bid, ask, mid, timestamp = cached
+        if now - timestamp > self._config.price_stale_seconds:
+            return None
+
+        return {'bid': bid, 'ask': ask, 'mid': mid}
+
+    @staticmethod
+    def _price_shard(product_id: str) -> int:
+        """Return the index of the price cache shard holding a product."""
+        return hash(product_id) & (_PRICE_SHARDS - 1)
+
+    def _store_price(self, product_id: str, bid: float, ask: float, mid: float, timestamp: float):
+        """Store the latest prices for a product, stamped with a time.monotonic() reading."""
+        shard = self._price_shard(product_id)
+        with self._price_locks[shard]:
+            self._price_shards[shard][product_id] = (bid, ask, mid, timestamp)
 
     def _handle_ticker_message(self, raw_msg: str):
         """Handle incoming ticker WebSocket message."""
         try:
             if isinstance(raw_msg, str):
-                msg = json.loads(raw_msg)
+                # Skip heartbeats and other channels without parsing them
+                if '"ticker"' not in raw_msg:
+                    return
+                msg = _loads(raw_msg)
+            elif isinstance(raw_msg, (bytes, bytearray)):
+                if b'"ticker"' not in raw_msg:
+                    return
+                msg = _loads(raw_msg)
             else:
                 msg = raw_msg
 
@@ -206,40 +326,43 @@ class WebSocketService:
             if channel != 'ticker':
                 return
 
-            events = msg.get('events', [])
-            for event in events:
-                tickers = event.get('tickers', [])
-                for ticker in tickers:
+            for event in msg.get('events') or ():
+                for ticker in event.get('tickers') or ():
                     product_id = ticker.get('product_id')
-                    if not product_id:
+                    best_bid = ticker.get('best_bid')
+                    best_ask = ticker.get('best_ask')
+                    # Skip tickers without a product or without both sides of the book
+                    if not product_id or best_bid is None or best_ask is None:
                         continue
 
                     try:
-                        bid = float(ticker.get('best_bid', 0))
-                        ask = float(ticker.get('best_ask', 0))
+                        bid = float(best_bid)
+                        ask = float(best_ask)
                         mid = (bid + ask) / 2 if bid and ask else 0
 
-                        with self._price_lock:
-                            self._price_cache[product_id] = {
-                                'bid': bid,
-                                'ask': ask,
-                                'mid': mid,
-                                'timestamp': time.time(),
-                            }
+                        self._store_price(product_id, bid, ask, mid, time.monotonic())
 
                     except (ValueError, TypeError) as e:
-                        logging.debug(f"Error parsing ticker for {product_id}: {e}")
+                        if _log.isEnabledFor(logging.DEBUG):
+                            _log.debug("Error parsing ticker for %s: %s", product_id, e)
 
         except json.JSONDecodeError:
-            logging.debug("Non-JSON ticker message received")
+            _log.debug("Non-JSON ticker message received")
         except Exception as e:
-            logging.error(f"Error handling ticker message: {e}")
+            _log.error("Error handling ticker message: %s", e)
 
     def _handle_user_message(self, raw_msg: str):
         """Handle incoming user channel WebSocket message (fills)."""
         try:
             if isinstance(raw_msg, str):
-                msg = json.loads(raw_msg)
+                # Skip heartbeats and other channels without parsing them
+                if '"user"' not in raw_msg:
+                    return
+                msg = _loads(raw_msg)
+            elif isinstance(raw_msg, (bytes, bytearray)):
+                if b'"user"' not in raw_msg:
+                    return
+                msg = _loads(raw_msg)
             else:
                 msg = raw_msg
 
@@ -270,19 +393,20 @@ class WebSocketService:
                         'status': 'FILLED',
                     }
 
-                    logging.info(f"WS fill event: {fill_event['order_id']}")
+                    _log.info("WS fill event: %s", fill_event['order_id'])
 
-                    with self._fill_lock:
-                        for callback in self._fill_callbacks:
-                            try:
-                                callback(fill_event)
-                            except Exception as e:
-                                logging.error(f"Fill callback error: {e}")
+                    if self._fill_worker is None:
+                        self._dispatch_fill(fill_event)
+                        continue
+                    try:
+                        self._fill_queue.put_nowait(fill_event)
+                    except queue.Full:
+                        _log.warning("Fill queue full, dropping WS fill event: %s", fill_event['order_id'])
 
         except json.JSONDecodeError:
-            logging.debug("Non-JSON user message received")
+            _log.debug("Non-JSON user message received")
         except Exception as e:
-            logging.error(f"Error handling user message: {e}")
+            _log.error("Error handling user message: %s", e)
 
     def stop(self):
         """Stop all WebSocket connections."""
@@ -290,18 +414,20 @@ class WebSocketService:
             try:
                 self._ticker_client.close()
             except Exception as e:
-                logging.error(f"Error closing ticker client: {e}")
+                _log.error("Error closing ticker client: %s", e)
             self._ticker_client = None
 
         if self._user_client:
             try:
                 self._user_client.close()
             except Exception as e:
-                logging.error(f"Error closing user client: {e}")
+                _log.error("Error closing user client: %s", e)
             self._user_client = None
 
+        self._stop_fill_dispatcher()
+
         self._connected = False
-        logging.info("WebSocket connections stopped")
+        _log.info("WebSocket connections stopped")
 
     def get_subscribed_products(self) -> List[str]:
         """Get list of products subscribed to ticker."""
@@ -309,5 +435,8 @@ class WebSocketService:
 
     def get_cached_products(self) -> List[str]:
         """Get list of products with cached prices."""
-        with self._price_lock:
-            return list(self._price_cache.keys())
+        products = []
+        for lock, shard in zip(self._price_locks, self._price_shards):
+            with lock:
+                products.extend(shard)
+        return products